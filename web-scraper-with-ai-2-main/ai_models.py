@@ -1,8 +1,5 @@
 #ai_models.py
-from gpt_api import generate_with_gpt
-from ollama import generate_with_ollama
-from cohere_api import generate_with_cohere
-from gemini import generate_with_gemini  # Importo la funzione per gemini
+from llm_client import generate_response
 
 def send_request_to_ai(prompt, use_ollama=False, use_cohere=False, use_gpt=False, use_gemini=False):
     """
@@ -15,25 +12,14 @@ def send_request_to_ai(prompt, use_ollama=False, use_cohere=False, use_gpt=False
     :param use_gemini: Flag per usare Gemini.
     :return: Risposta generata dal modello.
     """
-    responses = []
-
-    if use_gpt:
-        response_text_gpt = generate_with_gpt(prompt=prompt, temperature=0.7)
-        responses.append(f"GPT: {response_text_gpt}")
-
-    elif use_ollama:
-        response_text_ollama = generate_with_ollama(prompt=prompt)
-        responses.append(f"Ollama: {response_text_ollama}")
-
-    elif use_cohere:
-        response_text_cohere = generate_with_cohere(prompt=prompt, temperature=0.7)
-        responses.append(f"Cohere: {response_text_cohere}")
-
-    elif use_gemini:
-        response_text_gemini = generate_with_gemini(prompt=prompt)
-        responses.append(f"Gemini: {response_text_gemini}")
-
-    return "\n".join(responses) if responses else "Nessun modello selezionato."
+    # Solo il primo modello selezionato risponde, in quest'ordine di priorità
+    return generate_response(
+        prompt,
+        use_ollama=use_ollama and not use_gpt,
+        use_cohere=use_cohere and not (use_gpt or use_ollama),
+        use_gpt=use_gpt,
+        use_gemini=use_gemini and not (use_gpt or use_ollama or use_cohere),
+    )
 
 def process_request(query, use_ollama=False, use_cohere=False, use_gpt=False, use_gemini=False):
     """
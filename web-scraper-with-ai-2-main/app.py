@@ -9,6 +9,11 @@ import secrets
 from ai_models import send_request_to_ai  # Importa la funzione per gestire la richiesta AI
 from datetime import datetime  # Importa datetime per l'anno corrente
 from execute_scraping import execute_scraping
+from crawl_checkpoint import CrawlCheckpoint, new_job_id
+from exceptions import CheckpointMismatchError
+from graph_rendering import GRAPH_KINDS, render as render_graph
+from driver_pool import get_driver_pool
+import parse_pool
 from maps import generate_map_tiles_and_process
 import json
 from gpt_api import generate_with_gpt
@@ -397,6 +402,21 @@ def generate_maps():
     # GET: Visualizza la pagina iniziale
     return render_template('maps_results.html', results=None)
 
+@app.route('/link_graph/<job_id>/<kind>')
+def link_graph(job_id, kind):
+    # Il grafo viene disegnato alla prima richiesta e poi servito dalla cache
+    if kind not in GRAPH_KINDS or not re.fullmatch(r'[\w-]+', job_id):
+        return "Grafo non trovato.", 404
+    with CrawlCheckpoint(job_id) as checkpoint:
+        if not checkpoint.has_state():
+            return "Job di crawling non trovato.", 404
+        try:
+            path = render_graph(checkpoint.load_graph(), job_id, kind)
+        except Exception as e:
+            logging.exception("Errore durante la generazione del grafo")
+            return f"Errore durante la generazione del grafo: {e}", 500
+    return redirect(url_for('static', filename=f"graphs/{os.path.basename(path)}"))
+
 @app.route('/scraping_interface', methods=['GET', 'POST'])
 def scraping_interface():
     if request.method == 'POST':
@@ -407,17 +427,21 @@ def scraping_interface():
         enable_gpt = request.form.get('enable_gpt')  # Controlla se il flag è presente
         gpt_recursion_depth = int(request.form.get('gpt_recursion_depth'))
         model_2 = request.form.get('model_2')  # Controlla se il flag è presente
+        # Job di crawling da riprendere; se vuoto ne viene creato uno nuovo
+        job_id = request.form.get('job_id', '').strip() or new_job_id()
 
         if enable_gpt:  # Se il flag è attivato
             # Perform the scraping
                     try:
                         json_output=""
                         for i in range(gpt_recursion_depth):
+                            # Ogni iterazione ha il proprio crawl: riprendendo il job, ognuna riprende il suo
+                            crawl_job_id = f"{job_id}-{i}"
                             if model_2:
                                 from prova import execute_scraping as execute_scraping2
-                                summaries=execute_scraping2(query, search_engine, num_pages, recursion_depth)
+                                summaries=execute_scraping2(query, search_engine, num_pages, recursion_depth, crawl_job_id)
                             else:
-                                summaries = execute_scraping(query, search_engine, num_pages, recursion_depth)
+                                summaries = execute_scraping(query, search_engine, num_pages, recursion_depth, crawl_job_id)
 
                             # Prompt to generate JSON with GPT
                             prompt= f"""
@@ -443,6 +467,8 @@ def scraping_interface():
                         return render_template(
                             'scraping_interface.html',
                             result=summaries,
+                            job_id=job_id,
+                            graph_job_id=crawl_job_id,
                             gpt_json=json_output
                         )
 
@@ -452,9 +478,13 @@ def scraping_interface():
                         flash(f"Errore nella decodifica del JSON generato: {e.msg}", 'error')
                         return redirect(url_for('scraping_interface'))
 
+                    except CheckpointMismatchError as e:
+                        flash(f"Impossibile riprendere il job: {e}", "error")
+                        return redirect(url_for('scraping_interface'))
+
                     except Exception as e:
                         logging.exception("Errore durante lo scraping o la generazione del JSON")
-                        flash(f"Errore durante l'elaborazione: {str(e)}", "error")
+                        flash(f"Errore durante l'elaborazione: {str(e)} (job {job_id}, riprendibile)", "error")
                         return redirect(url_for('scraping_interface'))
 
 
@@ -462,9 +492,9 @@ def scraping_interface():
                 try:
                     if model_2:
                         from prova import execute_scraping as execute_scraping2
-                        summaries=execute_scraping2(query, search_engine, num_pages, recursion_depth)
+                        summaries=execute_scraping2(query, search_engine, num_pages, recursion_depth, job_id)
                     else:
-                        summaries = execute_scraping(query, search_engine, num_pages, recursion_depth)
+                        summaries = execute_scraping(query, search_engine, num_pages, recursion_depth, job_id)
 
                     # Prompt to generate JSON with GPT
                     prompt = f"""
@@ -488,12 +518,14 @@ def scraping_interface():
                         return render_template(
                             'scraping_interface.html',
                             result=summaries,
+                            job_id=job_id,
                             gpt_json=json_data
                         )
                     else:
                         return render_template(
                             'scraping_interface.html',
                             result=summaries,
+                            job_id=job_id,
                             gpt_json=summaries
                         )
 
@@ -502,12 +534,20 @@ def scraping_interface():
                     flash(f"Errore nella decodifica del JSON generato: {e.msg}", 'error')
                     return redirect(url_for('scraping_interface'))
 
+                except CheckpointMismatchError as e:
+                    flash(f"Impossibile riprendere il job: {e}", "error")
+                    return redirect(url_for('scraping_interface'))
+
                 except Exception as e:
                     logging.exception("Errore durante lo scraping o la generazione del JSON")
-                    flash(f"Errore durante l'elaborazione: {str(e)}", "error")
+                    flash(f"Errore durante l'elaborazione: {str(e)} (job {job_id}, riprendibile)", "error")
                     return redirect(url_for('scraping_interface'))
 
     return render_template('scraping_interface.html')
 
 if __name__ == '__main__':
+    # Avvia un browser headless e i processi di parsing in background, solo nel processo servito dal reloader
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        get_driver_pool().prewarm()
+        parse_pool.prewarm()
     app.run(debug=True)
@@ -1,37 +1,6 @@
 #audio_processor.py
 import whisper
-from gpt_api import generate_with_gpt
-from ollama import generate_with_ollama
-from cohere_api import generate_with_cohere
-from gemini import generate_with_gemini  # Importo la funzione per gemini
-
-def generate_response(prompt, use_ollama, use_cohere, use_gpt, use_gemini):
-    """
-    Generates a response using selected AI models based on the provided flags.
-
-    :param prompt: The text prompt to pass to the AI models.
-    :param use_ollama, use_cohere, use_gpt, use_gemini: Flags indicating which AI models to use.
-    :return: A combined response string from the selected models.
-    """
-    responses = []
-
-    if use_ollama:
-        response_text_ollama = generate_with_ollama(prompt=prompt)
-        responses.append(f"Ollama: {response_text_ollama}")
-
-    if use_cohere:
-        response_text_cohere = generate_with_cohere(prompt=prompt, temperature=0.7)
-        responses.append(f"Cohere: {response_text_cohere}")
-
-    if use_gpt:
-        response_text_gpt = generate_with_gpt(prompt=prompt, temperature=0.7)
-        responses.append(f"GPT: {response_text_gpt}")
-
-    if use_gemini:
-        response_text_gemini = generate_with_gemini(prompt=prompt)
-        responses.append(f"Gemini: {response_text_gemini}")
-
-    return "\n".join(responses) if responses else "No model selected."
+from llm_client import generate_response
 
 def process_audio(audio_file_path, query, output_file, use_ollama, use_cohere, use_gpt, use_gemini):
     """
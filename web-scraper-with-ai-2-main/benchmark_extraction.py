@@ -0,0 +1,115 @@
+#benchmark_extraction.py
+
+"""
+Micro-benchmark of the HTML extraction backends over a corpus of saved pages.
+
+Usage:
+    python benchmark_extraction.py [corpus_dir] [--repeat N]
+    python benchmark_extraction.py [corpus_dir] --fetch URL [URL ...]
+    python benchmark_extraction.py [corpus_dir] --fetch-file files/benchmark_urls.txt
+
+The corpus is every .html/.htm file of corpus_dir (files/saved_pages by
+default). It is not committed: build it once with --fetch, or with
+--fetch-file and a list of URLs, one per line, such as the reference mix
+of files/benchmark_urls.txt. Pages saved from a browser can be copied
+there as well.
+For every installed backend, in full-text and main-content mode, it
+reports pages per second, MB per second and the average text length.
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import time
+from html_extraction import available_backends, parse_page, to_text
+
+DEFAULT_CORPUS_DIR = os.path.join('files', 'saved_pages')
+DEFAULT_URLS_FILE = os.path.join('files', 'benchmark_urls.txt')
+
+
+def save_pages(urls, corpus_dir):
+    import http_client
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    for url in urls:
+        try:
+            response = http_client.get(url, content_types=http_client.HTML_TYPES, use_cache=False)
+        except Exception as e:
+            print(f"Skipping {url}: {e}")
+            continue
+        if response.status_code != 200:
+            print(f"Skipping {url}: status {response.status_code}")
+            continue
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16] + '.html'
+        with open(os.path.join(corpus_dir, name), 'wb') as f:
+            f.write(response.content)
+        print(f"Saved {url} as {name}")
+
+
+def read_urls(path):
+    """URLs of a list file, one per line; blank lines and # comments are skipped."""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def load_corpus(corpus_dir):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, '*.htm*'))):
+        with open(path, 'rb') as f:
+            pages.append((path, to_text(f.read())))
+    return pages
+
+
+def run(pages, repeat):
+    total_bytes = sum(len(html.encode('utf-8')) for _, html in pages)
+    rows = []
+    for backend in available_backends():
+        for main_content in (False, True):
+            lengths = []
+            start = time.perf_counter()
+            for _ in range(repeat):
+                lengths = [len(parse_page(html, 'http://localhost/', main_content, backend)[0]) for _, html in pages]
+            elapsed = time.perf_counter() - start
+            rows.append((
+                backend,
+                'main' if main_content else 'full',
+                len(pages) * repeat / elapsed,
+                total_bytes * repeat / elapsed / 1e6,
+                sum(lengths) / len(lengths),
+            ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML text extraction backends.")
+    parser.add_argument('corpus_dir', nargs='?', default=DEFAULT_CORPUS_DIR)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--fetch', nargs='+', metavar='URL', help="Download pages into the corpus first.")
+    parser.add_argument(
+        '--fetch-file', metavar='PATH', help=f"Download the URLs listed in PATH into the corpus first, e.g. {DEFAULT_URLS_FILE}."
+    )
+    args = parser.parse_args()
+
+    urls = list(args.fetch or [])
+    if args.fetch_file:
+        urls += read_urls(args.fetch_file)
+    if urls:
+        save_pages(urls, args.corpus_dir)
+
+    pages = load_corpus(args.corpus_dir)
+    if not pages:
+        print(
+            f"No .html files in {args.corpus_dir}. Save some pages there, or build the reference corpus with:\n"
+            f"    python benchmark_extraction.py {args.corpus_dir} --fetch-file {DEFAULT_URLS_FILE}"
+        )
+        return
+
+    print(f"{len(pages)} pages, {args.repeat} rounds, backends: {', '.join(available_backends())}\n")
+    print(f"{'backend':<12} {'mode':<5} {'pages/s':>10} {'MB/s':>8} {'avg chars':>10}")
+    for backend, mode, pages_per_second, mb_per_second, avg_chars in run(pages, args.repeat):
+        print(f"{backend:<12} {mode:<5} {pages_per_second:>10.1f} {mb_per_second:>8.2f} {avg_chars:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
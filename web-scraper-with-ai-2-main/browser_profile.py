@@ -0,0 +1,98 @@
+#browser_profile.py
+
+import functools
+import logging
+from typing import Sequence
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SIZE = (1920, 1080)
+# Requests Chrome drops before sending them: images, fonts and audio/video
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.ogg', '*.mp3', '*.m4a', '*.wav', '*.m3u8',
+]
+BLOCKED_CONTENT_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.media_stream': 2,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def chromedriver_path():
+    """
+    Path of the chromedriver binary, resolved once per process with
+    webdriver-manager. None lets Selenium Manager find it instead.
+    """
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    except Exception as e:
+        logger.warning(f"webdriver-manager could not resolve chromedriver ({e}), using Selenium Manager.")
+        return None
+
+
+def chrome_options(block_resources=True, window_size=WINDOW_SIZE):
+    """
+    Options of the shared browser profile: headless, no extensions, and an
+    eager page load strategy, so get() returns at DOMContentLoaded instead
+    of waiting for every subresource.
+
+    :param block_resources: Also disable images, fonts and media. Turn it off for screenshots.
+    """
+    options = Options()
+    options.page_load_strategy = 'eager'
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-notifications")
+    options.add_argument("--mute-audio")
+    options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+    if block_resources:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option('prefs', BLOCKED_CONTENT_PREFS)
+    return options
+
+
+def block_requests(driver, patterns=BLOCKED_URL_PATTERNS):
+    """Makes Chrome drop requests matching patterns (fonts and media included, which no option disables)."""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+    except Exception as e:
+        logger.warning(f"Could not block resources over DevTools: {e}")
+
+
+def launch_chrome(block_resources=True, window_size=WINDOW_SIZE):
+    """Starts a Chrome WebDriver with the shared profile."""
+    path = chromedriver_path()
+    service = Service(path) if path else Service()
+    driver = webdriver.Chrome(service=service, options=chrome_options(block_resources, window_size))
+    if block_resources:
+        block_requests(driver)
+    return driver
+
+
+def any_element_present(selectors: Sequence[str]):
+    """Expected condition for WebDriverWait: true once any of the CSS selectors matches."""
+    selector = ', '.join(selectors)
+    return lambda driver: bool(driver.find_elements(By.CSS_SELECTOR, selector))
+
+
+def wait_for_any(driver, selectors: Sequence[str], timeout: float = 10):
+    """
+    Waits until any of the CSS selectors matches.
+
+    Raises:
+        TimeoutException: If none matches within timeout seconds.
+    """
+    WebDriverWait(driver, timeout, poll_frequency=0.1).until(any_element_present(selectors))
@@ -13,3 +13,39 @@ AZURE_ENDPOINT = ''
 AZURE_KEY = ''
 AZURE_ENDPOINT_IMAGE = ''
 AZURE_API_KEY_IMAGE = ''
+HTTP_CACHE_PATH = 'files/http_cache.sqlite'
+HTTP_CACHE_TTL = 24 * 60 * 60
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+HTML_PARSER_BACKEND = None  # 'selectolax', 'lxml' or 'html.parser'; None picks the fastest installed
+MAIN_CONTENT_EXTRACTION = False  # keep only the article/main element and drop navigation and other boilerplate
+PARSE_WORKERS = None  # HTML parsing processes; None uses all cores, 0 parses in-process
+FETCH_WORKERS = 8
+CRAWL_CHECKPOINT_PATH = 'files/crawl_jobs.sqlite'
+MAX_CRAWL_PAGES = 200  # pages fetched per recursive crawl, most relevant first; None for no limit
+HOST_INITIAL_TIMEOUT = 15  # seconds, for hosts without latency samples yet
+HOST_MIN_TIMEOUT = 3
+HOST_FAILURE_THRESHOLD = 3  # consecutive failures before a host's circuit opens
+HOST_COOLDOWN = 120  # seconds a host is skipped once its circuit opens
+RESPECT_ROBOTS = True
+SITEMAP_SEEDS_PER_HOST = 10
+GRAPH_OUTPUT_DIR = 'static/graphs'  # link graphs rendered on demand, cached per crawl job
+SUMMARY_TOP_K = None  # pages summarized per crawl, best ranked first; None summarizes all
+SUMMARY_TIME_BUDGET = None  # seconds
+PAGERANK_WEIGHT = 0.5
+DRIVER_POOL_SIZE = 2  # headless Chrome instances shared by all searches
+DRIVER_MAX_USES = 50  # uses before a driver is recycled
+DRIVER_ACQUIRE_TIMEOUT = 120  # seconds to wait for a free driver
+SERP_HTTP_ENABLED = True  # read static results pages over HTTP, using Chrome only when they are unusable
+SEARCH_CONCURRENCY = 4  # (language, engine) searches run at the same time
+SERP_CACHE_PATH = 'files/serp_cache.sqlite'
+SERP_CACHE_TTL = 6 * 60 * 60  # seconds search results are reused for the same engine, query and page
+FUSION_TOP_N = 30  # unique URLs kept after fusing all (language, engine) searches; None keeps all
+COHERE_CHAT_URL = 'https://api.cohere.ai/v1/chat'
+OLLAMA_MODEL = 'llama3'
+LLM_TIMEOUTS = {'gpt': 60, 'gemini': 60, 'cohere': 60, 'ollama': 120}  # seconds per attempt
+LLM_RETRIES = 3
+LLM_BACKOFF = 1  # seconds before the first retry, doubled at each attempt
+LLM_BACKOFF_MAX = 30
+LLM_DEADLINES = {'gpt': 120, 'gemini': 120, 'cohere': 120, 'ollama': 240}  # seconds per call, retries included
+OLLAMA_PROBE_INTERVAL = 60  # seconds a check that the local Ollama server is up stays valid
@@ -0,0 +1,207 @@
+#crawl_checkpoint.py
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from config import CRAWL_CHECKPOINT_PATH
+from exceptions import CheckpointMismatchError
+from link_graph import LinkGraph
+
+logger = logging.getLogger(__name__)
+
+
+def new_job_id():
+    """Short random identifier for a crawl job."""
+    return uuid.uuid4().hex[:12]
+
+
+class CrawlCheckpoint:
+    """
+    Persists the state of a crawl job in SQLite so it can be resumed.
+
+    Every URL the crawler enqueues is stored as a node (with its depth and
+    parent, which gives both the graph edges and the visited set), and
+    every page it finishes is stored with its text. The frontier is the set
+    of nodes without a finished page. Records are buffered and written in
+    one transaction every `every` pages or `interval` seconds, with a
+    page always written together with the links it discovered.
+
+    close() the checkpoint when done with it, or use it as a context manager.
+    """
+
+    def __init__(self, job_id, path=CRAWL_CHECKPOINT_PATH, every=25, interval=30):
+        self.job_id = job_id
+        self.path = path
+        self.every = every
+        self.interval = interval
+        self.buffer = []
+        self.pages_since_flush = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                query TEXT,
+                search_engine TEXT,
+                recursion_depth INTEGER,
+                status TEXT,
+                created_at REAL,
+                updated_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS nodes (
+                job_id TEXT,
+                seq INTEGER,
+                url TEXT,
+                depth INTEGER,
+                parent TEXT,
+                score REAL,
+                PRIMARY KEY (job_id, url)
+            );
+            CREATE TABLE IF NOT EXISTS links (
+                job_id TEXT,
+                source TEXT,
+                target TEXT,
+                PRIMARY KEY (job_id, source, target)
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                job_id TEXT,
+                url TEXT,
+                text TEXT,
+                PRIMARY KEY (job_id, url)
+            );"""
+        )
+        self.conn.commit()
+        self.next_seq = self.conn.execute(
+            "SELECT COALESCE(MAX(seq), -1) + 1 FROM nodes WHERE job_id = ?", (job_id,)
+        ).fetchone()[0]
+
+    def status(self):
+        row = self.conn.execute("SELECT status FROM jobs WHERE job_id = ?", (self.job_id,)).fetchone()
+        return row[0] if row else None
+
+    def has_state(self):
+        return self.next_seq > 0
+
+    def start(self, query, search_engine, recursion_depth):
+        """
+        Marks the job as running, recording its parameters.
+
+        :raises CheckpointMismatchError: If the job has saved state for another query, search engine or depth.
+        """
+        now = time.time()
+        with self.lock:
+            saved = self.conn.execute(
+                "SELECT query, search_engine, recursion_depth FROM jobs WHERE job_id = ?", (self.job_id,)
+            ).fetchone()
+            if self.has_state() and saved is not None and saved != (query, search_engine, recursion_depth):
+                raise CheckpointMismatchError(
+                    f"Job {self.job_id} was started for {saved[0]!r} on {saved[1]} with depth {saved[2]}, "
+                    f"not {query!r} on {search_engine} with depth {recursion_depth}"
+                )
+            self.conn.execute(
+                """INSERT INTO jobs VALUES (?, ?, ?, ?, 'running', ?, ?)
+                   ON CONFLICT(job_id) DO UPDATE SET
+                       query = excluded.query, search_engine = excluded.search_engine,
+                       recursion_depth = excluded.recursion_depth, status = 'running',
+                       updated_at = excluded.updated_at""",
+                (self.job_id, query, search_engine, recursion_depth, now, now)
+            )
+            self.conn.commit()
+
+    def load(self):
+        """
+        Reads the saved state of the job.
+
+        :return: (nodes as (url, depth, parent, score) in discovery order, dict of finished url -> text or None)
+        """
+        nodes = self.conn.execute(
+            "SELECT url, depth, parent, score FROM nodes WHERE job_id = ? ORDER BY seq", (self.job_id,)
+        ).fetchall()
+        pages = dict(self.conn.execute("SELECT url, text FROM pages WHERE job_id = ?", (self.job_id,)))
+        return nodes, pages
+
+    def load_links(self):
+        """Links found between pages already in the graph, as (source, target) pairs."""
+        return self.conn.execute("SELECT source, target FROM links WHERE job_id = ?", (self.job_id,)).fetchall()
+
+    def load_graph(self):
+        """The saved link graph of the job as a LinkGraph."""
+        graph = LinkGraph()
+        for url, depth, parent in self.conn.execute(
+            "SELECT url, depth, parent FROM nodes WHERE job_id = ? ORDER BY seq", (self.job_id,)
+        ):
+            if parent:
+                graph.add_edge(parent, url)
+            else:
+                graph.add_node(url, depth - 1)
+        for source, target in self.load_links():
+            graph.add_edge(source, target)
+        return graph
+
+    def add_node(self, url, depth, parent=None, score=0.0):
+        self.buffer.append(('node', (self.job_id, self.next_seq, url, depth, parent, score)))
+        self.next_seq += 1
+
+    def add_link(self, source, target):
+        self.buffer.append(('link', (self.job_id, source, target)))
+
+    def add_page(self, url, text):
+        self.buffer.append(('page', (self.job_id, url, text)))
+        self.pages_since_flush += 1
+
+    def should_flush(self):
+        return bool(self.buffer) and (
+            self.pages_since_flush >= self.every or time.monotonic() - self.last_flush >= self.interval
+        )
+
+    def take_batch(self):
+        batch, self.buffer = self.buffer, []
+        self.pages_since_flush = 0
+        self.last_flush = time.monotonic()
+        return batch
+
+    def write(self, batch):
+        if not batch:
+            return
+        with self.lock:
+            for kind, row in batch:
+                if kind == 'node':
+                    self.conn.execute("INSERT OR IGNORE INTO nodes VALUES (?, ?, ?, ?, ?, ?)", row)
+                elif kind == 'link':
+                    self.conn.execute("INSERT OR IGNORE INTO links VALUES (?, ?, ?)", row)
+                else:
+                    self.conn.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?)", row)
+            self.conn.execute("UPDATE jobs SET updated_at = ? WHERE job_id = ?", (time.time(), self.job_id))
+            self.conn.commit()
+        logger.debug(f"Checkpointed {len(batch)} records for job {self.job_id}.")
+
+    def flush(self):
+        self.write(self.take_batch())
+
+    def finish(self):
+        self.flush()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'done', updated_at = ? WHERE job_id = ?", (time.time(), self.job_id)
+            )
+            self.conn.commit()
+
+    def close(self):
+        """Writes the buffered records and closes the database connection."""
+        if self.conn is None:
+            return
+        self.flush()
+        with self.lock:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,164 @@
+#driver_pool.py
+
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from browser_profile import launch_chrome
+from config import DRIVER_POOL_SIZE, DRIVER_MAX_USES, DRIVER_ACQUIRE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Bounded pool of headless Chrome drivers shared by all searches, launched
+    with the resource-blocking profile of browser_profile.
+
+    At most `size` browsers run at once; callers beyond that wait for one
+    to be released. A driver is health-checked before it is handed out and
+    replaced if it does not answer, and it is recycled after `max_uses`
+    uses or after a WebDriver error, so leaks in long-lived browsers do not
+    pile up.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES, launcher=launch_chrome):
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self.launcher = launcher
+        self.idle = []
+        self.total = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def launch(self):
+        started = time.monotonic()
+        driver = self.launcher()
+        logger.info(f"Chrome WebDriver started in {time.monotonic() - started:.1f} seconds.")
+        return PooledDriver(driver)
+
+    @staticmethod
+    def is_healthy(pooled):
+        try:
+            return pooled.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error closing Chrome WebDriver: {e}")
+
+    def acquire(self, timeout=DRIVER_ACQUIRE_TIMEOUT):
+        """
+        Takes a healthy driver from the pool, launching one if the pool is not full.
+
+        Raises:
+            TimeoutError: If no driver is released within timeout seconds.
+            WebDriverException: If a new browser cannot be started.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.condition:
+                while not self.idle and self.total >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or self.closed:
+                        raise TimeoutError(f"No Chrome WebDriver available after {timeout} seconds.")
+                    self.condition.wait(remaining)
+                if self.idle:
+                    pooled = self.idle.pop()
+                else:
+                    pooled = None
+                    self.total += 1
+
+            if pooled is None:
+                try:
+                    return self.launch()
+                except Exception:
+                    self.discard()
+                    raise
+            if self.is_healthy(pooled):
+                return pooled
+            logger.warning("Discarding unresponsive Chrome WebDriver.")
+            self.quit(pooled)
+            self.discard()
+
+    def discard(self):
+        with self.condition:
+            self.total -= 1
+            self.condition.notify()
+
+    def release(self, pooled, broken=False):
+        pooled.uses += 1
+        if broken or self.closed or pooled.uses >= self.max_uses:
+            self.quit(pooled)
+            self.discard()
+            return
+        with self.condition:
+            self.idle.append(pooled)
+            self.condition.notify()
+
+    @contextmanager
+    def driver(self):
+        """
+        Context manager lending a driver:
+
+            with get_driver_pool().driver() as driver:
+                driver.get(url)
+        """
+        pooled = self.acquire()
+        broken = False
+        try:
+            yield pooled.driver
+        except TimeoutException:
+            # A wait that ran out says nothing about the browser itself
+            raise
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(pooled, broken)
+
+    def prewarm(self, count=1):
+        """Starts up to count browsers in the background so the first search does not wait for one."""
+        def start():
+            try:
+                self.release(self.acquire(), False)
+            except Exception as e:
+                logger.warning(f"Could not prewarm Chrome WebDriver: {e}")
+
+        for _ in range(min(count, self.size)):
+            threading.Thread(target=start, daemon=True).start()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.total -= len(idle)
+            self.condition.notify_all()
+        for pooled in idle:
+            self.quit(pooled)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Returns the process-wide DriverPool, closed automatically at exit."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -2,3 +2,19 @@
 class TempoEccessivoError(Exception):
     """Custom exception to handle timeout situations."""
     pass
+
+class ContentTooLargeError(Exception):
+    """Custom exception raised when a response exceeds the download budget."""
+    pass
+
+class UnsupportedContentError(Exception):
+    """Custom exception raised when a response has a content type that is not accepted."""
+    pass
+
+class CircuitOpenError(Exception):
+    """Custom exception raised when a host is skipped because its circuit breaker is open."""
+    pass
+
+class CheckpointMismatchError(Exception):
+    """Custom exception raised when a crawl job is resumed with another query, search engine or depth."""
+    pass
@@ -4,22 +4,40 @@ import logging
 from scraper_config import ScraperConfig
 from recursive_scraper import RecursiveScraper
 from search_results import get_search_results
+from crawl_checkpoint import CrawlCheckpoint
 
 logger = logging.getLogger(__name__)
 
-def execute_scraping(query, search_engine, num_pages, recursion_depth):
-    config = ScraperConfig(query, search_engine, num_pages, recursion_depth)
-    initial_links = get_search_results(config.query, config.search_engine, config.num_pages)
+def execute_scraping(query, search_engine, num_pages, recursion_depth, job_id=None):
+    """
+    Searches, crawls and summarizes. With a job_id the crawl is checkpointed
+    under that id, and calling again with the same id resumes it: the search
+    is skipped and pages already fetched are not fetched again.
 
-    if not initial_links:
-        logger.error("No initial links found. Exiting.")
-        return {}
+    Raises:
+        CheckpointMismatchError: If job_id was saved for another query, search engine or depth.
+    """
+    config = ScraperConfig(query, search_engine, num_pages, recursion_depth)
+    checkpoint = CrawlCheckpoint(job_id) if job_id else None
+    try:
+        if checkpoint is not None:
+            saved_status = checkpoint.status()
+            checkpoint.start(config.query, config.search_engine, config.recursion_depth)
 
-    scraper = RecursiveScraper(config)
-    for link in initial_links:
-        scraper.scrape_page(link, current_depth=1)
+        if checkpoint is not None and checkpoint.has_state():
+            logger.info(f"Resuming crawl job {job_id} ({saved_status}).")
+            initial_links = []
+        else:
+            initial_links = get_search_results(config.query, config.search_engine, config.num_pages)
+            if not initial_links:
+                logger.error("No initial links found. Exiting.")
+                return {}
 
-    scraper.generate_all_graphs()
+        scraper = RecursiveScraper(config, checkpoint)
+        scraper.crawl(initial_links)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
 
     summaries = scraper.summarize_text()
     return summaries
@@ -3,15 +3,9 @@ import pandas as pd
 import pdfplumber
 import xlrd
 import openpyxl
-from gpt_api import generate_with_gpt
-from ollama import generate_with_ollama
-from cohere_api import generate_with_cohere
-from gemini import generate_with_gemini  # Importo la funzione per gemini
-import requests
-from bs4 import BeautifulSoup
+from llm_client import generate_response
 import urllib3
-from requests.exceptions import ConnectTimeout, RequestException, HTTPError
-from urllib3.exceptions import MaxRetryError
+from html_extraction import extract_text
 
 def fetch_and_extract_text(content):
     """
@@ -22,40 +16,11 @@ def fetch_and_extract_text(content):
     """
     if isinstance(content, str) and content.strip().startswith('<'):
         # Assume it's HTML content
-        soup = BeautifulSoup(content, 'html.parser')
-        return soup.get_text(separator=' ', strip=True)
+        return extract_text(content)
     else:
         # Assume it's already plain text
         return content
 
-def generate_response(prompt, use_ollama, use_cohere, use_gpt, use_gemini):
-    """
-    Generates a response using selected AI models based on the provided flags.
-
-    :param prompt: The text prompt to pass to the AI models.
-    :param use_ollama, use_cohere, use_gpt, use_gemini: Flags indicating which AI models to use.
-    :return: A combined response string from the selected models.
-    """
-    responses = []
-
-    if use_ollama:
-        response_text_ollama = generate_with_ollama(prompt=prompt)
-        responses.append(f"Ollama: {response_text_ollama}")
-
-    if use_cohere:
-        response_text_cohere = generate_with_cohere(prompt=prompt, temperature=0.7)
-        responses.append(f"Cohere: {response_text_cohere}")
-
-    if use_gpt:
-        response_text_gpt = generate_with_gpt(prompt=prompt, temperature=0.7)
-        responses.append(f"GPT: {response_text_gpt}")
-
-    if use_gemini:
-        response_text_gemini = generate_with_gemini(prompt=prompt)
-        responses.append(f"Gemini: {response_text_gemini}")
-
-    return "\n".join(responses) if responses else "Nessun modello selezionato."
-
 def process_pages(pages, query, output_file, use_ollama, use_cohere, use_gpt, use_gemini):
     """
     Processes the provided pages by extracting text and generating responses using selected AI models.
@@ -3,10 +3,7 @@
 import spacy
 import difflib
 import os
-from gpt_api import generate_with_gpt
-from ollama import generate_with_ollama
-from cohere_api import generate_with_cohere
-from gemini import generate_with_gemini  # Importo la funzione per gemini
+from llm_client import generate_response
 import docx2txt
 import PyPDF2
 import openpyxl
@@ -161,32 +158,3 @@ def process_text_files(file_paths, question, output_file, use_ollama, use_cohere
 
     except Exception as e:
         print(f"Si è verificato un errore durante l'elaborazione dei file di testo: {str(e)}")
-
-
-def generate_response(prompt, use_ollama, use_cohere, use_gpt, use_gemini):
-    """
-    Generates a response using selected AI models based on the provided flags.
-
-    :param prompt: The text prompt to pass to the AI models.
-    :param use_ollama, use_cohere, use_gpt, use_gemini: Flags indicating which AI models to use.
-    :return: A combined response string from the selected models.
-    """
-    responses = []
-
-    if use_ollama:
-        response_text_ollama = generate_with_ollama(prompt=prompt)
-        responses.append(f"Ollama: {response_text_ollama}")
-
-    if use_cohere:
-        response_text_cohere = generate_with_cohere(prompt=prompt)
-        responses.append(f"Cohere: {response_text_cohere}")
-
-    if use_gpt:
-        response_text_gpt = generate_with_gpt(prompt=prompt)
-        responses.append(f"GPT: {response_text_gpt}")
-
-    if use_gemini:
-        response_text_gemini = generate_with_gemini(prompt=prompt)
-        responses.append(f"Gemini: {response_text_gemini}")
-
-    return "\n".join(responses) if responses else "No model selected."
@@ -0,0 +1,90 @@
+#frontier.py
+
+import asyncio
+import itertools
+import re
+from urllib.parse import unquote, urlparse
+
+TOKEN_RE = re.compile(r'[^\W\d_]{2,}|\d{2,}', re.UNICODE)
+STOPWORDS = frozenset("""
+    the and for with from that this what which who how are was were not but you your our its into about
+    all any can has have more most other some such than then there these they will www http https html
+    htm php asp index com org net
+    il lo la le gli un una uno di da in con su per tra fra che chi cosa come del della dei delle degli
+    al alla ai alle nel nella nei nelle sul sulla non piu sono ed se anche
+""".split())
+# Tokens are compared on their first characters, a cheap stand-in for stemming
+STEM_CHARS = 5
+
+# Weights of the link features, summing to 1. The relevance of the page a
+# link was found on is inherited, so links on on-topic pages rank higher.
+ANCHOR_WEIGHT = 0.4
+URL_WEIGHT = 0.25
+CONTEXT_WEIGHT = 0.2
+PARENT_WEIGHT = 0.15
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def stem(token):
+    return token[:STEM_CHARS]
+
+
+def url_text(url):
+    """The words of a URL: host, path and query, percent-decoded."""
+    parsed = urlparse(url)
+    return unquote(f"{parsed.netloc} {parsed.path} {parsed.query}")
+
+
+class LinkScorer:
+    """
+    Scores pages and links by how many of the query terms they contain.
+    All scores are between 0 and 1.
+    """
+
+    def __init__(self, query):
+        self.terms = {stem(token) for token in tokenize(query or '')}
+
+    def overlap(self, text):
+        """Fraction of the query terms that appear in the text."""
+        if not self.terms or not text:
+            return 0.0
+        found = self.terms.intersection(stem(token) for token in tokenize(text))
+        return len(found) / len(self.terms)
+
+    def page_score(self, text):
+        return self.overlap(text)
+
+    def url_score(self, url):
+        return self.overlap(url_text(url))
+
+    def score(self, anchor, parent_score=0.0):
+        """
+        :param anchor: An html_extraction.Anchor.
+        :param parent_score: page_score() of the page the link was found on.
+        """
+        return (
+            ANCHOR_WEIGHT * self.overlap(anchor.text)
+            + URL_WEIGHT * self.url_score(anchor.url)
+            + CONTEXT_WEIGHT * self.overlap(anchor.context)
+            + PARENT_WEIGHT * parent_score
+        )
+
+
+class Frontier(asyncio.PriorityQueue):
+    """
+    Crawl frontier that hands out the highest-scoring URL first. Ties go to
+    the shallower URL, then to the one enqueued first, so with no query
+    terms the crawl is breadth-first.
+
+    Entries are (-score, depth, sequence, url) tuples.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.counter = itertools.count()
+
+    def push(self, url, depth, score):
+        self.put_nowait((-score, depth, next(self.counter), url))
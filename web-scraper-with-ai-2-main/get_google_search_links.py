@@ -1,16 +1,13 @@
 #get_google_search_links.py
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-import time
 import urllib.parse
 from typing import List
-from webdriver_manager.chrome import ChromeDriverManager  # Import WebDriver Manager
+from driver_pool import get_driver_pool
+from config import SERP_HTTP_ENABLED
+import serp_http
+from serp_cache import get_serp_cache
+from serp_selectors import extract_results, selectors_for
+from browser_profile import wait_for_any
 
 def get_google_search_links(query: str, num_pages: int) -> List[str]:
     """
@@ -21,53 +18,41 @@ def get_google_search_links(query: str, num_pages: int) -> List[str]:
         num_pages (int): Number of result pages to scrape.
 
     Returns:
-        List[str]: A list of unique result URLs, excluding ads and the first result.
+        List[str]: The unique result URLs in rank order, excluding ads.
     """
-    # Configure Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run Chrome in headless mode
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
+    serp_cache = get_serp_cache()
+    cached = serp_cache.get_pages('Google', query, num_pages)
+    if cached is not None:
+        return cached
 
-    # Set up the Chrome WebDriver using WebDriver Manager
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    if SERP_HTTP_ENABLED:
+        links = serp_http.search(query, 'Google', num_pages)
+        if links is not None:
+            return links
 
-    all_links = set()  # Use a set to avoid duplicate URLs
+    all_links = {}  # Ordered and without duplicates: keys are the URLs in rank order
 
     try:
-        for page in range(num_pages):
-            # Construct the Google search URL
-            url = f"https://www.google.com/search?q={urllib.parse.quote(query)}&start={page * 10}"
-            print(f"Navigating to: {url}")
-            driver.get(url)
+        # Borrow a headless Chrome WebDriver from the shared pool
+        with get_driver_pool().driver() as driver:
+            for page in range(num_pages):
+                # Construct the Google search URL
+                url = f"https://www.google.com/search?q={urllib.parse.quote(query)}&start={page * 10}"
+                print(f"Navigating to: {url}")
+                driver.get(url)
 
-            # Wait for the search results to load
-            WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.ID, "search")))
-            time.sleep(2)  # Additional wait to ensure dynamic content is loaded
+                # Wait for the result links themselves instead of a fixed delay
+                wait_for_any(driver, selectors_for('Google').links, 20)
 
-            # Parse the page content
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
+                # Parse the page content once; ads and Google's own links are dropped
+                page_links = extract_results('Google', driver.page_source)
+                all_links.update(dict.fromkeys(page_links))
+                serp_cache.put('Google', query, page, page_links)
 
-            # Find all search result links
-            results = soup.find_all('div', class_='yuRUbf')
-            for result in results:
-                link = result.find('a', href=True)
-                if link:
-                    href = link['href']
-                    # Exclude ads and verify the link
-                    if not any(ad in href for ad in ['googleads', 'googleadservices']):
-                        all_links.add(href)
-
-            print(f"Found {len(all_links)} unique links so far.")
+                print(f"Found {len(all_links)} unique links so far.")
 
     except Exception as e:
         print(f"An error occurred: {e}")
 
-    finally:
-        # Ensure the driver is closed
-        driver.quit()
-
-    # Convert set to list and exclude the first link (often the search page itself)
-    return list(all_links)[1:]
+    # Links back to Google are already dropped by extract_results, so no result is sliced off
+    return list(all_links)
@@ -0,0 +1,231 @@
+#graph_rendering.py
+
+import heapq
+import json
+import logging
+import math
+import os
+import threading
+from config import GRAPH_OUTPUT_DIR
+
+logger = logging.getLogger(__name__)
+
+GRAPH_KINDS = ('static', 'interactive', 'hierarchy', 'json')
+FILE_NAMES = {
+    'static': '{key}_static.png',
+    'interactive': '{key}_interactive.html',
+    'hierarchy': '{key}_hierarchy.html',
+    'json': '{key}.json',
+}
+# Above this many nodes Plotly draws with WebGL (Scattergl)
+WEBGL_THRESHOLD = 1000
+# Only the roots and the most linked-to nodes get a text label; all nodes keep their hover text
+LABEL_LIMIT = 40
+LABEL_CHARS = 60
+
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def level_order(graph):
+    """
+    Groups the nodes of a LinkGraph by level, each level ordered by the
+    position of the node's parent in the level above, so that children sit
+    next to their parent and edges do not criss-cross.
+
+    :return: List of lists of node ids, one per level.
+    """
+    indptr, indices = graph.csr(reverse=True)
+    by_level = {}
+    for node, level in enumerate(graph.levels):
+        by_level.setdefault(level, []).append(node)
+
+    position = {}
+    rows = []
+    for level in sorted(by_level):
+        nodes = by_level[level]
+        nodes.sort(key=lambda node: min(
+            (position.get(parent, math.inf) for parent in indices[indptr[node]:indptr[node + 1]]),
+            default=math.inf
+        ))
+        for i, node in enumerate(nodes):
+            position[node] = i
+        rows.append(nodes)
+    return rows
+
+
+def radial_layout(rows):
+    """Level-based layout on concentric circles: roots in the centre, each level one ring further out."""
+    positions = {}
+    for radius, nodes in enumerate(rows):
+        step = 2 * math.pi / len(nodes)
+        for i, node in enumerate(nodes):
+            angle = i * step
+            positions[node] = (radius * math.cos(angle), radius * math.sin(angle))
+    return positions
+
+
+def layered_layout(rows, horizontal_spacing=1, vertical_spacing=2):
+    """Level-based layout in rows, top to bottom, each row centred."""
+    positions = {}
+    for level, nodes in enumerate(rows):
+        x_start = -((len(nodes) - 1) * horizontal_spacing) / 2
+        for i, node in enumerate(nodes):
+            positions[node] = (x_start + i * horizontal_spacing, -level * vertical_spacing)
+    return positions
+
+
+def labeled_nodes(graph):
+    """Ids of the nodes that get a text label: every root, then the most linked-to nodes."""
+    degrees = graph.in_degrees()
+    top_level = min(graph.levels)
+    labels = set([node for node, level in enumerate(graph.levels) if level == top_level][:LABEL_LIMIT])
+    for node in heapq.nlargest(LABEL_LIMIT, range(len(graph)), key=degrees.__getitem__):
+        if len(labels) >= LABEL_LIMIT:
+            break
+        labels.add(node)
+    return labels
+
+
+def short_label(url):
+    url = url.split('://', 1)[-1]
+    return url if len(url) <= LABEL_CHARS else url[:LABEL_CHARS - 1] + '…'
+
+
+def edge_segments(graph, positions):
+    edge_x, edge_y = [], []
+    for source, target in zip(graph.sources, graph.targets):
+        x0, y0 = positions[source]
+        x1, y1 = positions[target]
+        edge_x += [x0, x1, None]
+        edge_y += [y0, y1, None]
+    return edge_x, edge_y
+
+
+def render_static(graph, path):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    positions = radial_layout(level_order(graph))
+    fig, ax = plt.subplots(figsize=(12, 8))
+    segments = [(positions[s], positions[t]) for s, t in zip(graph.sources, graph.targets)]
+    ax.add_collection(LineCollection(segments, linewidths=0.3, colors='#888', alpha=0.6))
+    xs, ys = zip(*(positions[node] for node in range(len(graph))))
+    ax.scatter(xs, ys, s=8 if len(graph) > WEBGL_THRESHOLD else 30, c=list(graph.levels), cmap='viridis', zorder=2)
+    for node in labeled_nodes(graph):
+        x, y = positions[node]
+        ax.text(x, y, short_label(graph.url_of(node)), fontsize=5)
+    ax.set_title("Link Hierarchy Graph")
+    ax.set_axis_off()
+    ax.autoscale()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+
+def plotly_figure(graph, positions, title, **layout):
+    import plotly.graph_objects as go
+
+    scatter = go.Scattergl if len(graph) > WEBGL_THRESHOLD else go.Scatter
+    edge_x, edge_y = edge_segments(graph, positions)
+    edge_trace = scatter(x=edge_x, y=edge_y, line=dict(width=0.5, color='#888'), hoverinfo='none', mode='lines')
+
+    node_x, node_y = zip(*(positions[node] for node in range(len(graph))))
+    node_trace = scatter(
+        x=node_x, y=node_y, mode='markers', text=graph.urls, hoverinfo='text',
+        marker=dict(
+            showscale=True,
+            colorscale='Viridis',
+            color=list(graph.levels),
+            size=6 if len(graph) > WEBGL_THRESHOLD else 10,
+            colorbar=dict(title=dict(text="Node Depth", side="right")),
+            line_width=0.5
+        )
+    )
+
+    labels = sorted(labeled_nodes(graph))
+    label_trace = go.Scatter(
+        x=[positions[node][0] for node in labels],
+        y=[positions[node][1] for node in labels],
+        mode='text', text=[short_label(graph.url_of(node)) for node in labels],
+        textposition="bottom center", hoverinfo='skip'
+    )
+
+    return go.Figure(
+        data=[edge_trace, node_trace, label_trace],
+        layout=go.Layout(
+            title=dict(text=title, x=0.5),
+            showlegend=False,
+            hovermode='closest',
+            margin=dict(b=20, l=5, r=5, t=40),
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            **layout
+        )
+    )
+
+
+def render_interactive(graph, path):
+    fig = plotly_figure(graph, radial_layout(level_order(graph)), "Interactive Link Graph")
+    # plotly.min.js is written once next to the pages and shared by all of them
+    fig.write_html(path, include_plotlyjs='directory')
+
+
+def render_hierarchy(graph, path):
+    fig = plotly_figure(
+        graph, layered_layout(level_order(graph)),
+        "Interactive Hierarchical Link Graph", width=1200, height=800
+    )
+    fig.write_html(path, include_plotlyjs='directory')
+
+
+def render_json(graph, path):
+    with open(path, 'w') as json_file:
+        json.dump(graph.node_link_data(), json_file)
+
+
+RENDERERS = {
+    'static': render_static,
+    'interactive': render_interactive,
+    'hierarchy': render_hierarchy,
+    'json': render_json,
+}
+
+
+def render(graph, key, kind, output_dir=GRAPH_OUTPUT_DIR):
+    """
+    Renders one view of a link graph, unless it was already rendered for a
+    graph of the same size under the same key.
+
+    Args:
+        graph (LinkGraph): The crawl graph.
+        key (str): Cache key, usually the crawl job id.
+        kind (str): 'static' (PNG), 'interactive' (radial Plotly page), 'hierarchy' (layered Plotly page) or 'json'.
+        output_dir (str): Directory of the rendered files, shared by every crawl.
+
+    Returns:
+        str: Path of the rendered file.
+    """
+    if kind not in RENDERERS:
+        raise ValueError(f"Unknown graph kind '{kind}', expected one of {', '.join(GRAPH_KINDS)}")
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, FILE_NAMES[kind].format(key=key))
+    meta_path = f"{path}.meta"
+    signature = f"{graph.number_of_nodes()} {graph.number_of_edges()}"
+
+    with _locks_lock:
+        lock = _locks.setdefault(path, threading.Lock())
+    with lock:
+        if os.path.exists(path) and os.path.exists(meta_path):
+            with open(meta_path) as f:
+                if f.read() == signature:
+                    return path
+        if not len(graph):
+            raise ValueError("The link graph is empty.")
+        logger.info(f"Rendering {kind} link graph for {key} ({signature.replace(' ', ' nodes, ')} edges).")
+        RENDERERS[kind](graph, path)
+        with open(meta_path, 'w') as f:
+            f.write(signature)
+        logger.info(f"Link graph saved as {path}.")
+    return path
@@ -0,0 +1,149 @@
+#host_health.py
+
+import logging
+import threading
+import time
+from config import HOST_MIN_TIMEOUT, HOST_INITIAL_TIMEOUT, HOST_FAILURE_THRESHOLD, HOST_COOLDOWN
+from exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factors of the latency estimates, as in TCP's retransmission timer (RFC 6298)
+ALPHA = 1 / 8
+BETA = 1 / 4
+MAX_COOLDOWN = 3600
+
+
+class HostStats:
+    def __init__(self):
+        self.srtt = None
+        self.rttvar = None
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        # While a half-open probe is in flight, the instant after which it is presumed lost
+        self.probe_until = 0.0
+
+
+class HostHealth:
+    """
+    Per-host latency tracking and circuit breaker.
+
+    Every host keeps a smoothed latency and its variation; its timeout is
+    srtt + 4 * rttvar, clamped between min_timeout and the caller's timeout.
+    After failure_threshold consecutive failures (timeouts, connection
+    errors, 5xx or 429) the circuit opens and requests to the host are
+    refused for the cool-down, which doubles every time the circuit opens
+    again. After the cool-down the circuit is half-open and a single probe
+    request goes through while the others are still refused: a success
+    closes the circuit, a failure opens it again. A probe that reports
+    neither within initial_timeout seconds is presumed lost and the next
+    request becomes the probe.
+    """
+
+    def __init__(
+        self, min_timeout=HOST_MIN_TIMEOUT, initial_timeout=HOST_INITIAL_TIMEOUT,
+        failure_threshold=HOST_FAILURE_THRESHOLD, cooldown=HOST_COOLDOWN
+    ):
+        self.min_timeout = min_timeout
+        self.initial_timeout = initial_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.hosts = {}
+        self.lock = threading.Lock()
+
+    def stats(self, host):
+        stats = self.hosts.get(host)
+        if stats is None:
+            stats = self.hosts[host] = HostStats()
+        return stats
+
+    def timeout_for(self, host, max_timeout):
+        """
+        :param host: The host about to be requested.
+        :param max_timeout: The timeout asked for by the caller, used as upper bound.
+        :return: The timeout in seconds for the next request to the host.
+        """
+        with self.lock:
+            stats = self.stats(host)
+            if stats.srtt is None:
+                return min(self.initial_timeout, max_timeout)
+            timeout = stats.srtt + 4 * stats.rttvar
+        return min(max(timeout, self.min_timeout), max_timeout)
+
+    @staticmethod
+    def wait_of(stats, now):
+        return max(0.0, stats.open_until - now, stats.probe_until - now)
+
+    def retry_after(self, host):
+        """Seconds left before the circuit of the host lets a request through, 0 if closed or ready for a probe."""
+        with self.lock:
+            stats = self.hosts.get(host)
+            return self.wait_of(stats, time.monotonic()) if stats else 0.0
+
+    def is_open(self, host):
+        return self.retry_after(host) > 0
+
+    def check(self, host):
+        """
+        Lets a request to the host through, making it the probe if the circuit is half-open.
+
+        Raises:
+            CircuitOpenError: If the circuit of the host is open, or half-open with a probe in flight.
+        """
+        with self.lock:
+            stats = self.hosts.get(host)
+            if stats is None or stats.failures < self.failure_threshold:
+                return
+            now = time.monotonic()
+            wait = self.wait_of(stats, now)
+            if wait <= 0:
+                stats.probe_until = now + self.initial_timeout
+                return
+        raise CircuitOpenError(f"{host} is unhealthy, skipped for another {wait:.0f} seconds")
+
+    def record_success(self, host, elapsed):
+        with self.lock:
+            stats = self.stats(host)
+            if stats.srtt is None:
+                stats.srtt, stats.rttvar = elapsed, elapsed / 2
+            else:
+                stats.rttvar = (1 - BETA) * stats.rttvar + BETA * abs(stats.srtt - elapsed)
+                stats.srtt = (1 - ALPHA) * stats.srtt + ALPHA * elapsed
+            stats.failures = 0
+            stats.trips = 0
+            stats.open_until = 0.0
+            stats.probe_until = 0.0
+
+    def record_failure(self, host):
+        with self.lock:
+            stats = self.stats(host)
+            stats.failures += 1
+            stats.probe_until = 0.0
+            # Requests already in flight when the circuit opened do not trip it again
+            if stats.failures < self.failure_threshold or stats.open_until > time.monotonic():
+                return
+            cooldown = min(self.cooldown * 2 ** stats.trips, MAX_COOLDOWN)
+            stats.trips += 1
+            stats.open_until = time.monotonic() + cooldown
+        logger.warning(f"Circuit open for {host} after {stats.failures} failures, skipping it for {cooldown:.0f} seconds.")
+
+    def record(self, host, status_code, elapsed):
+        """Records a response: 5xx and 429 count as failures, anything else as a latency sample."""
+        if status_code >= 500 or status_code == 429:
+            self.record_failure(host)
+        else:
+            self.record_success(host, elapsed)
+
+
+_health = None
+_health_lock = threading.Lock()
+
+
+def get_host_health():
+    """Returns the process-wide HostHealth."""
+    global _health
+    with _health_lock:
+        if _health is None:
+            _health = HostHealth()
+        return _health
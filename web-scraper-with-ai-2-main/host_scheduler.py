@@ -0,0 +1,153 @@
+#host_scheduler.py
+
+import asyncio
+import heapq
+import random
+import time
+from urllib.parse import urlparse
+
+class HostScheduler:
+    """
+    Per-host politeness for the crawler: every host keeps its own
+    next-allowed time and a cap on in-flight requests, so a delay on one
+    domain never holds back requests to the others. A host's robots.txt
+    Crawl-delay, when set, is used as its minimum delay.
+
+    Frontier entries that find their host busy are parked in a per-host
+    heap instead of being retried on their own timers. Each host has at
+    most one wake-up pending: when it fires and the host is ready, the
+    best entry of its heap is handed to on_ready, so pages of one host are
+    still fetched best first, however long they waited.
+    """
+
+    def __init__(self, min_delay=1, max_delay=5, max_per_host=1, busy_retry=0.25, on_ready=None):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_per_host = max(1, max_per_host)
+        self.busy_retry = busy_retry
+        # Called with a parked entry once its host can take a request again
+        self.on_ready = on_ready
+        self.next_allowed = {}
+        self.in_flight = {}
+        self.crawl_delays = {}
+        self.parked = {}
+        self.wakeups = {}
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+
+    def set_crawl_delay(self, host, delay):
+        """
+        Sets the minimum delay between two requests to a host, e.g. from its robots.txt.
+
+        :param host: The host, as returned by host_of().
+        :param delay: Seconds, or None to use only the default delay range.
+        """
+        if delay:
+            self.crawl_delays[host] = delay
+        else:
+            self.crawl_delays.pop(host, None)
+
+    def delay_for(self, host):
+        return max(random.uniform(self.min_delay, self.max_delay), self.crawl_delays.get(host, 0))
+
+    def reserve(self, url):
+        """
+        Tries to reserve a request slot for the host of the URL.
+
+        :param url: The URL about to be fetched.
+        :return: 0 if the slot was reserved, otherwise the number of seconds to wait before trying again.
+        """
+        host = self.host_of(url)
+        now = time.monotonic()
+        wait = self.next_allowed.get(host, 0.0) - now
+        if self.in_flight.get(host, 0) >= self.max_per_host:
+            return max(wait, self.busy_retry)
+        if wait > 0:
+            return wait
+
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.next_allowed[host] = now + self.delay_for(host)
+        self.schedule_wakeup(host)
+        return 0
+
+    def release(self, url):
+        """
+        Releases the slot taken by reserve() and pushes the host's next-allowed
+        time at least one delay past the end of this request.
+
+        :param url: The URL that was fetched.
+        """
+        host = self.host_of(url)
+        self.in_flight[host] = max(0, self.in_flight.get(host, 0) - 1)
+        self.next_allowed[host] = max(
+            self.next_allowed.get(host, 0.0),
+            time.monotonic() + self.delay_for(host)
+        )
+        self.schedule_wakeup(host)
+
+    def park(self, url, entry):
+        """
+        Holds a frontier entry whose host is busy until the host is ready.
+        Must be called from the event loop.
+
+        :param url: The URL of the entry.
+        :param entry: A comparable frontier entry, best first, e.g. (-score, depth, sequence, url).
+        """
+        host = self.host_of(url)
+        heapq.heappush(self.parked.setdefault(host, []), entry)
+        self.schedule_wakeup(host)
+
+    def skip(self, url):
+        """
+        Tells the scheduler that an entry of the URL's host was dropped without
+        a request, so the host's next parked entry is handed out at once.
+
+        :param url: The URL of the dropped entry.
+        """
+        self.schedule_wakeup(self.host_of(url))
+
+    def parked_count(self):
+        return sum(len(entries) for entries in self.parked.values())
+
+    def schedule_wakeup(self, host, min_delay=0.0):
+        # A full host is woken by release(), not by a timer
+        if not self.parked.get(host) or self.in_flight.get(host, 0) >= self.max_per_host:
+            return
+        loop = asyncio.get_running_loop()
+        when = loop.time() + max(self.next_allowed.get(host, 0.0) - time.monotonic(), min_delay, 0.0)
+        # Keep one wake-up per host, the earliest
+        pending = self.wakeups.get(host)
+        if pending is not None:
+            if pending.when() <= when:
+                return
+            pending.cancel()
+        self.wakeups[host] = loop.call_at(when, self.wake, host)
+
+    def wake(self, host):
+        del self.wakeups[host]
+        entries = self.parked.get(host)
+        if not entries:
+            return
+        ready = (
+            self.in_flight.get(host, 0) < self.max_per_host
+            and self.next_allowed.get(host, 0.0) <= time.monotonic()
+        )
+        if not ready:
+            self.schedule_wakeup(host)
+            return
+        entry = heapq.heappop(entries)
+        if not entries:
+            del self.parked[host]
+        self.on_ready(entry)
+        # Normally the entry takes the slot and reserve() or release() schedules the next
+        # wake-up; this one covers an entry dropped before it is fetched without skip().
+        self.schedule_wakeup(host, self.busy_retry)
+
+    def cancel_wakeups(self):
+        """Cancels the pending wake-ups and forgets the parked entries, e.g. when a crawl ends."""
+        for handle in self.wakeups.values():
+            handle.cancel()
+        self.wakeups.clear()
+        self.parked.clear()
@@ -0,0 +1,369 @@
+#html_extraction.py
+
+import logging
+import re
+from typing import List, NamedTuple, Optional, Sequence, Tuple, Union
+from urllib.parse import urljoin, urlparse
+from bs4 import BeautifulSoup
+from config import HTML_PARSER_BACKEND
+
+logger = logging.getLogger(__name__)
+
+# Optional fast parsers, tried in order of speed
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+NON_TEXT_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'iframe', 'object', 'head']
+BOILERPLATE_TAGS = ['nav', 'header', 'footer', 'aside', 'form', 'button', 'select', 'dialog']
+BOILERPLATE_ROLES = ('navigation', 'banner', 'contentinfo', 'complementary', 'search')
+BOILERPLATE_RE = re.compile(
+    r'(^|[\s_-])(nav|navbar|menu|footer|header|sidebar|breadcrumbs?|cookies?|consent|banner|'
+    r'share|social|comments?|related|advert|ads|promo|popup|modal|newsletter|subscribe)($|[\s_-])',
+    re.IGNORECASE
+)
+# Containers that may be dropped by the class/id heuristic
+HEURISTIC_TAGS = {'div', 'section', 'ul', 'ol', 'table', 'span', 'p'}
+# Main content candidates; neither they nor their ancestors are ever dropped as boilerplate
+MAIN_SELECTORS = ['article', 'main', '[role="main"]']
+# Nearest of these around a link gives the text surrounding it
+CONTEXT_TAGS = {'p', 'li', 'td', 'dd', 'dt', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'blockquote', 'figcaption', 'caption'}
+CONTEXT_LEVELS = 3
+ANCHOR_CHARS = 200
+CONTEXT_CHARS = 300
+CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+BACKENDS = ('selectolax', 'lxml', 'html.parser')
+
+
+def available_backends() -> List[str]:
+    """Backends whose parser is installed, fastest first."""
+    installed = {'selectolax': SelectolaxParser is not None, 'lxml': lxml is not None, 'html.parser': True}
+    return [name for name in BACKENDS if installed[name]]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """
+    Picks the parser backend: the one requested if installed, otherwise the
+    fastest available one. html.parser is always available as a fallback.
+    """
+    available = available_backends()
+    requested = backend or HTML_PARSER_BACKEND
+    if requested in available:
+        return requested
+    if requested:
+        logger.debug(f"HTML backend '{requested}' not installed, using '{available[0]}'.")
+    return available[0]
+
+
+def to_text(html: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    """
+    Decodes raw HTML bytes with encoding, normally the charset of the
+    Content-Type header. Without one, the charset declared in a <meta> tag
+    is used, defaulting to UTF-8.
+    """
+    if isinstance(html, str):
+        return html
+    if encoding:
+        try:
+            return html.decode(encoding, errors='replace')
+        except LookupError:
+            logger.debug(f"Unknown encoding '{encoding}', looking for a <meta> charset.")
+    match = CHARSET_RE.search(html[:4096])
+    encoding = match.group(1).decode('ascii', 'ignore') if match else 'utf-8'
+    try:
+        return html.decode(encoding, errors='replace')
+    except LookupError:
+        return html.decode('utf-8', errors='replace')
+
+
+def normalize_whitespace(text: str) -> str:
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def is_boilerplate(tag: str, attributes: dict) -> bool:
+    if attributes.get('role') in BOILERPLATE_ROLES:
+        return True
+    if tag not in HEURISTIC_TAGS:
+        return False
+    label = f"{attributes.get('class') or ''} {attributes.get('id') or ''}"
+    return bool(BOILERPLATE_RE.search(label))
+
+
+class Anchor(NamedTuple):
+    """An outbound link with the text of the <a> tag and the text of the block around it."""
+    url: str
+    text: str
+    context: str
+
+
+def absolute_links(hrefs, base_url: str) -> List[str]:
+    links = []
+    for href in hrefs:
+        href = urljoin(base_url, href.strip())
+        if urlparse(href).scheme in ('http', 'https'):
+            links.append(href)
+    return links
+
+
+def absolute_anchors(items, base_url: str) -> List[Anchor]:
+    anchors = []
+    for href, text, context in items:
+        href = urljoin(base_url, href.strip())
+        if urlparse(href).scheme in ('http', 'https'):
+            anchors.append(Anchor(href, normalize_whitespace(text)[:ANCHOR_CHARS], normalize_whitespace(context)[:CONTEXT_CHARS]))
+    return anchors
+
+
+# --- selectolax -------------------------------------------------------------
+
+def _selectolax_context(node) -> str:
+    parent = node.parent
+    for _ in range(CONTEXT_LEVELS):
+        if parent is None:
+            break
+        if parent.tag in CONTEXT_TAGS:
+            return parent.text(separator=' ')
+        parent = parent.parent
+    return ''
+
+
+def _selectolax_parse(html: str, base_url: Optional[str], main_content: bool, anchors: bool = False) -> Tuple[str, list]:
+    tree = SelectolaxParser(html)
+    if base_url is None:
+        hrefs = []
+    elif anchors:
+        hrefs = [
+            (node.attributes.get('href') or '', node.text(separator=' ') or node.attributes.get('title') or '', _selectolax_context(node))
+            for node in tree.css('a[href]')
+        ]
+    else:
+        hrefs = [node.attributes.get('href') or '' for node in tree.css('a[href]')]
+
+    tree.strip_tags(NON_TEXT_TAGS)
+    root = None
+    if main_content:
+        candidates = tree.css(', '.join(MAIN_SELECTORS))
+        if candidates:
+            root = max(candidates, key=lambda node: len(node.text(separator=' ')))
+        kept = set()
+        for node in candidates:
+            while node is not None:
+                kept.add(node.mem_id)
+                node = node.parent
+        doomed_ids = {
+            node.mem_id: node for node in tree.css(', '.join(BOILERPLATE_TAGS) + ', [class], [id], [role]')
+            if node.mem_id not in kept and (node.tag in BOILERPLATE_TAGS or is_boilerplate(node.tag, node.attributes))
+        }
+        # Decompose only the outermost matches: nodes inside a decomposed
+        # subtree are freed and must not be touched afterwards.
+        for node in list(doomed_ids.values()):
+            parent = node.parent
+            while parent is not None and parent.mem_id not in doomed_ids:
+                parent = parent.parent
+            if parent is None:
+                node.decompose()
+
+    root = root or tree.body or tree.root
+    text = root.text(separator=' ') if root is not None else ''
+    return normalize_whitespace(text), hrefs
+
+
+# --- lxml -------------------------------------------------------------------
+
+def _lxml_context(element) -> str:
+    for level, parent in enumerate(element.iterancestors()):
+        if level >= CONTEXT_LEVELS:
+            break
+        if parent.tag in CONTEXT_TAGS:
+            return parent.text_content()
+    return ''
+
+
+def _lxml_parse(html: str, base_url: Optional[str], main_content: bool, anchors: bool = False) -> Tuple[str, list]:
+    html = XML_DECLARATION_RE.sub('', html, count=1)
+    if not html.strip():
+        return '', []
+    root = lxml.html.fromstring(html)
+    if base_url is None:
+        hrefs = []
+    elif anchors:
+        hrefs = [
+            (element.get('href'), element.text_content() or element.get('title') or '', _lxml_context(element))
+            for element in root.xpath('//a[@href]')
+        ]
+    else:
+        hrefs = [str(href) for href in root.xpath('//a/@href')]
+
+    for element in list(root.iter(*NON_TEXT_TAGS)):
+        if element.getparent() is not None:
+            element.drop_tree()
+
+    target = root
+    if main_content:
+        candidates = root.xpath('//article | //main | //*[@role="main"]')
+        if candidates:
+            target = max(candidates, key=lambda element: len(element.text_content()))
+        kept = set(candidates)
+        for element in candidates:
+            kept.update(element.iterancestors())
+        doomed = [
+            element for element in root.iter()
+            if isinstance(element.tag, str) and element not in kept
+            and (element.tag in BOILERPLATE_TAGS or is_boilerplate(element.tag, element.attrib))
+        ]
+        for element in doomed:
+            if element.getparent() is not None:
+                element.drop_tree()
+    text = ' '.join(target.itertext())
+    return normalize_whitespace(text), hrefs
+
+
+# --- html.parser (BeautifulSoup) -------------------------------------------
+
+def _soup_context(a_tag) -> str:
+    for level, parent in enumerate(a_tag.parents):
+        if level >= CONTEXT_LEVELS:
+            break
+        if parent.name in CONTEXT_TAGS:
+            return parent.get_text(separator=' ')
+    return ''
+
+
+def _soup_parse(html: str, base_url: Optional[str], main_content: bool, anchors: bool = False) -> Tuple[str, list]:
+    soup = BeautifulSoup(html, 'html.parser')
+    if base_url is None:
+        hrefs = []
+    elif anchors:
+        hrefs = [
+            (a_tag['href'], a_tag.get_text(separator=' ') or a_tag.get('title') or '', _soup_context(a_tag))
+            for a_tag in soup.find_all('a', href=True)
+        ]
+    else:
+        hrefs = [a_tag['href'] for a_tag in soup.find_all('a', href=True)]
+
+    for element in soup(NON_TEXT_TAGS):
+        element.decompose()
+
+    target = soup
+    if main_content:
+        candidates = soup.select(', '.join(MAIN_SELECTORS))
+        if candidates:
+            target = max(candidates, key=lambda element: len(element.get_text()))
+        kept = {id(element) for element in candidates}
+        for element in candidates:
+            kept.update(id(parent) for parent in element.parents)
+        for element in soup.find_all(True):
+            if element.decomposed or id(element) in kept:
+                continue
+            attributes = {
+                'class': ' '.join(element.get('class') or []),
+                'id': element.get('id'),
+                'role': element.get('role'),
+            }
+            if element.name in BOILERPLATE_TAGS or is_boilerplate(element.name, attributes):
+                element.decompose()
+    text = target.get_text(separator=' ')
+    return normalize_whitespace(text), hrefs
+
+
+PARSERS = {
+    'selectolax': _selectolax_parse,
+    'lxml': _lxml_parse,
+    'html.parser': _soup_parse,
+}
+
+
+def parse_page(
+    html: Union[str, bytes],
+    base_url: Optional[str] = None,
+    main_content: bool = False,
+    backend: Optional[str] = None,
+    encoding: Optional[str] = None
+) -> Tuple[str, List[str]]:
+    """
+    Parses a page once and returns its visible text and its outbound links.
+
+    Links are collected before any boilerplate is stripped, so navigation
+    links are still returned in main-content mode.
+
+    Args:
+        html (Union[str, bytes]): The page source.
+        base_url (Optional[str]): URL of the page, used to resolve relative links. No links are returned if None.
+        main_content (bool): Keep only the longest article/main element, if any, and drop navigation,
+            headers, footers and similar boilerplate from the text.
+        backend (Optional[str]): 'selectolax', 'lxml' or 'html.parser'. Defaults to config.HTML_PARSER_BACKEND or the fastest installed.
+        encoding (Optional[str]): Charset of bytes input from the Content-Type header; None falls back to the <meta> charset.
+
+    Returns:
+        Tuple[str, List[str]]: The whitespace-normalized text and the absolute http(s) links.
+    """
+    text, hrefs = _parse(html, base_url, main_content, backend, anchors=False, encoding=encoding)
+    return text, absolute_links(hrefs, base_url) if base_url is not None else []
+
+
+def parse_page_anchors(
+    html: Union[str, bytes],
+    base_url: str,
+    main_content: bool = False,
+    backend: Optional[str] = None,
+    encoding: Optional[str] = None
+) -> Tuple[str, List[Anchor]]:
+    """
+    Like parse_page(), but every link comes with its anchor text and the
+    text of the paragraph, list item or cell around it, for link scoring.
+    """
+    text, items = _parse(html, base_url, main_content, backend, anchors=True, encoding=encoding)
+    return text, absolute_anchors(items, base_url)
+
+
+def _parse(html, base_url, main_content, backend, anchors, encoding=None):
+    html = to_text(html, encoding)
+    name = resolve_backend(backend)
+    try:
+        return PARSERS[name](html, base_url, main_content, anchors)
+    except Exception as e:
+        if name == 'html.parser':
+            raise
+        logger.warning(f"HTML backend '{name}' failed ({e}), falling back to html.parser.")
+        return _soup_parse(html, base_url, main_content, anchors)
+
+
+def extract_text(html: Union[str, bytes], main_content: bool = False, backend: Optional[str] = None) -> str:
+    """Visible text of a page; see parse_page()."""
+    return parse_page(html, None, main_content, backend)[0]
+
+
+def select_hrefs(html: Union[str, bytes], selectors: Sequence[str], backend: Optional[str] = None) -> List[str]:
+    """
+    Raw href values of the elements matched by the first CSS selector of
+    selectors that matches anything, in document order. The page is parsed
+    once, whatever the number of selectors tried, by the backend's parser.
+    """
+    html = to_text(html)
+    name = resolve_backend(backend)
+    if name == 'selectolax':
+        root = SelectolaxParser(html)
+        for selector in selectors:
+            nodes = root.css(selector)
+            if nodes:
+                return [node.attributes.get('href') or '' for node in nodes]
+        return []
+    # BeautifulSoup on the backend's parser: lxml.html needs the cssselect package for CSS selectors
+    soup = BeautifulSoup(html, 'lxml' if name == 'lxml' else 'html.parser')
+    for selector in selectors:
+        tags = soup.select(selector)
+        if tags:
+            return [tag.get('href', '') for tag in tags]
+    return []
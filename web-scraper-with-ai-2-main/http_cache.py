@@ -0,0 +1,153 @@
+#http_cache.py
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import httpx
+from url_utils import canonicalize_url
+from config import HTTP_CACHE_PATH, HTTP_CACHE_TTL, HTTP_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(url):
+    """Key under which a URL is cached."""
+    return canonicalize_url(url)
+
+
+class CacheEntry:
+    def __init__(self, url, content_type, etag, last_modified, body, stored_at):
+        self.url = url
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.stored_at = stored_at
+
+    def is_fresh(self, ttl):
+        return time.time() - self.stored_at < ttl
+
+    def validators(self):
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_response(self, url):
+        headers = {'content-type': self.content_type or '', 'x-cache': 'HIT'}
+        return httpx.Response(200, headers=headers, content=self.body, request=httpx.Request('GET', url))
+
+
+class HttpCache:
+    """
+    On-disk cache of fetched pages. Bodies are stored zlib-compressed in
+    SQLite together with their ETag/Last-Modified validators; entries
+    older than the TTL are revalidated, and the least recently used ones
+    are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(self, path=HTTP_CACHE_PATH, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB,
+                size INTEGER,
+                stored_at REAL,
+                accessed_at REAL
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def lookup(self, url):
+        key = cache_key(url)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT content_type, etag, last_modified, body, stored_at FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        content_type, etag, last_modified, body, stored_at = row
+        return CacheEntry(url, content_type, etag, last_modified, zlib.decompress(body), stored_at)
+
+    def store(self, url, response):
+        if 'no-store' in response.headers.get('cache-control', '').lower():
+            return
+        body = zlib.compress(response.content)
+        now = time.time()
+        key = cache_key(url)
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.headers.get('content-type'),
+                    response.headers.get('etag'),
+                    response.headers.get('last-modified'),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                )
+            )
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            self.evict()
+            self.conn.commit()
+
+    def refresh(self, url, response):
+        """Marks an entry fresh again after a 304 Not Modified."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                """UPDATE pages SET stored_at = ?, accessed_at = ?,
+                   etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                   WHERE key = ?""",
+                (now, now, response.headers.get('etag'), response.headers.get('last-modified'), cache_key(url))
+            )
+            self.conn.commit()
+
+    def evict(self):
+        # Caller holds self.lock
+        if self.total_bytes <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall()
+        evicted = 0
+        for key, size in rows:
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM pages WHERE key = ?", (key,))
+            self.total_bytes -= size
+            evicted += 1
+        logger.info(f"HTTP cache evicted {evicted} entries ({self.total_bytes} bytes left).")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Returns the process-wide HttpCache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HttpCache()
+        return _cache
@@ -0,0 +1,334 @@
+#http_client.py
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+import httpx
+import http_cache
+from host_health import get_host_health
+from config import MAX_PAGE_BYTES
+from exceptions import ContentTooLargeError, UnsupportedContentError
+
+logger = logging.getLogger(__name__)
+
+# httpx only decodes brotli bodies when the brotli package is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+DEFAULT_TIMEOUT = 10
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 40
+MAX_CONNECTIONS_PER_HOST = 6
+KEEPALIVE_EXPIRY = 30
+HTML_TYPES = ('text/html', 'application/xhtml+xml')
+# Errors that count against the health of a host
+HOST_FAILURES = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+_lock = threading.Lock()
+_clients: Dict[bool, httpx.Client] = {}
+_host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_async_state = weakref.WeakKeyDictionary()
+
+
+def _client_kwargs(verify: bool) -> dict:
+    return dict(
+        headers=DEFAULT_HEADERS,
+        verify=verify,
+        http2=HTTP2_AVAILABLE,
+        follow_redirects=True,
+        timeout=DEFAULT_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def _host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def get_client(verify: bool = True) -> httpx.Client:
+    """
+    Returns the process-wide pooled client, creating it on first use.
+
+    Args:
+        verify (bool): Whether TLS certificates are verified. Each setting gets its own pool.
+
+    Returns:
+        httpx.Client: A thread-safe client with keep-alive and compression enabled.
+    """
+    with _lock:
+        client = _clients.get(verify)
+        if client is None:
+            client = httpx.Client(**_client_kwargs(verify))
+            _clients[verify] = client
+            logger.info(f"Created pooled HTTP client (verify={verify}, http2={HTTP2_AVAILABLE}).")
+        return client
+
+
+def _is_cacheable(response: httpx.Response) -> bool:
+    # A body cut at the size budget is not the page, and a cached copy would be reused for any budget
+    if 'x-truncated' in response.headers:
+        return False
+    content_type = response.headers.get('content-type', '')
+    return response.status_code == 200 and any(t in content_type for t in ('text/', 'html', 'xml', 'json'))
+
+
+def _conditional_headers(headers: Optional[dict], entry) -> dict:
+    request_headers = dict(headers or {})
+    if entry is not None:
+        request_headers.update(entry.validators())
+    return request_headers
+
+
+def _apply_cache(cache, entry, url: str, response: httpx.Response) -> httpx.Response:
+    if entry is not None and response.status_code == 304:
+        cache.refresh(url, response)
+        return entry.to_response(url)
+    if cache is not None and _is_cacheable(response):
+        cache.store(url, response)
+    return response
+
+
+def sniff_content_type(chunk: bytes) -> str:
+    """
+    Guesses the type of a body from its first bytes, for responses that
+    send no usable Content-Type.
+    """
+    head = chunk[:512].lstrip().lower()
+    if head.startswith(b'%pdf'):
+        return 'application/pdf'
+    if head.startswith((b'<!doctype html', b'<html', b'<head', b'<body')) or b'<html' in head:
+        return 'text/html'
+    if head.startswith(b'<?xml'):
+        return 'application/xml'
+    if b'\x00' in head:
+        return 'application/octet-stream'
+    return 'text/plain'
+
+
+def _check_content_type(url: str, content_type: str, content_types: Optional[Iterable[str]]):
+    if content_types and not any(t in content_type for t in content_types):
+        raise UnsupportedContentError(f"{url} has content type '{content_type}'")
+
+
+def _check_headers(url: str, response: httpx.Response, max_bytes: int, content_types: Optional[Iterable[str]]) -> bool:
+    """
+    Validates the headers of a streamed 200 response before any body is read.
+
+    Returns:
+        bool: True if the type must be sniffed from the first chunk.
+    """
+    length = response.headers.get('content-length')
+    if length and length.isdigit() and int(length) > max_bytes:
+        raise ContentTooLargeError(f"{url} is {length} bytes, budget is {max_bytes}")
+    content_type = response.headers.get('content-type', '').lower()
+    if not content_type or content_type.startswith('application/octet-stream'):
+        return True
+    _check_content_type(url, content_type, content_types)
+    return False
+
+
+def _capped_response(response: httpx.Response, body: bytes, truncated: bool, sniffed_type: Optional[str] = None) -> httpx.Response:
+    # The body is already decompressed, so encoding/length headers no longer apply
+    headers = [
+        (key, value) for key, value in response.headers.items()
+        if key.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')
+        and not (sniffed_type and key.lower() == 'content-type')
+    ]
+    if sniffed_type:
+        headers.append(('content-type', sniffed_type))
+    if truncated:
+        headers.append(('x-truncated', '1'))
+    return httpx.Response(response.status_code, headers=headers, content=body, request=response.request)
+
+
+def _read_capped(url: str, response: httpx.Response, max_bytes: int, content_types: Optional[Iterable[str]]) -> httpx.Response:
+    if response.status_code != 200:
+        return _capped_response(response, b'', False)
+    must_sniff = _check_headers(url, response, max_bytes, content_types)
+    sniffed_type = None
+    body = bytearray()
+    for chunk in response.iter_bytes():
+        if must_sniff and sniffed_type is None:
+            sniffed_type = sniff_content_type(chunk)
+            _check_content_type(url, sniffed_type, content_types)
+        body += chunk
+        if len(body) >= max_bytes:
+            logger.info(f"Truncated {url} at {max_bytes} bytes.")
+            return _capped_response(response, bytes(body[:max_bytes]), True, sniffed_type)
+    return _capped_response(response, bytes(body), False, sniffed_type)
+
+
+async def _read_capped_async(url: str, response: httpx.Response, max_bytes: int, content_types: Optional[Iterable[str]]) -> httpx.Response:
+    if response.status_code != 200:
+        return _capped_response(response, b'', False)
+    must_sniff = _check_headers(url, response, max_bytes, content_types)
+    sniffed_type = None
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        if must_sniff and sniffed_type is None:
+            sniffed_type = sniff_content_type(chunk)
+            _check_content_type(url, sniffed_type, content_types)
+        body += chunk
+        if len(body) >= max_bytes:
+            logger.info(f"Truncated {url} at {max_bytes} bytes.")
+            return _capped_response(response, bytes(body[:max_bytes]), True, sniffed_type)
+    return _capped_response(response, bytes(body), False, sniffed_type)
+
+
+def get(
+    url: str,
+    headers: Optional[dict] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    verify: bool = True,
+    use_cache: bool = True,
+    max_bytes: int = MAX_PAGE_BYTES,
+    content_types: Optional[Iterable[str]] = None
+) -> httpx.Response:
+    """
+    Performs a streamed GET through the shared pool, holding at most
+    MAX_CONNECTIONS_PER_HOST concurrent requests per host. Fresh cached
+    pages are served from the on-disk cache; stale ones are revalidated.
+
+    The timeout adapts to the latency measured on the host (see
+    host_health), with the timeout argument as upper bound, and hosts
+    that keep failing are refused until their cool-down ends.
+
+    The headers are checked before the body is downloaded: responses
+    announcing more than max_bytes or a type outside content_types are
+    abandoned. Bodies without a length are cut at max_bytes and marked
+    with an 'x-truncated' header. Non-200 responses come back without body.
+
+    Args:
+        url (str): The URL to fetch.
+        headers (Optional[dict]): Extra headers merged over DEFAULT_HEADERS.
+        timeout (float): Maximum timeout in seconds.
+        verify (bool): Whether TLS certificates are verified.
+        use_cache (bool): Whether to go through the HTTP cache.
+        max_bytes (int): Byte budget for the decoded body.
+        content_types (Optional[Iterable[str]]): Accepted content types, e.g. HTML_TYPES. None accepts anything.
+
+    Returns:
+        httpx.Response: The response, with the body already read.
+
+    Raises:
+        ContentTooLargeError: If the announced length exceeds max_bytes.
+        UnsupportedContentError: If the declared or sniffed type is not accepted.
+        CircuitOpenError: If the host's circuit breaker is open.
+    """
+    cache = http_cache.get_cache() if use_cache else None
+    entry = cache.lookup(url) if cache else None
+    if entry is not None and entry.is_fresh(cache.ttl):
+        _check_content_type(url, entry.content_type or '', content_types)
+        return entry.to_response(url)
+
+    host = _host_of(url)
+    health = get_host_health()
+    health.check(host)
+    with _lock:
+        semaphore = _host_semaphores.setdefault(host, threading.BoundedSemaphore(MAX_CONNECTIONS_PER_HOST))
+    with semaphore:
+        request_headers = _conditional_headers(headers, entry)
+        started = time.monotonic()
+        try:
+            with get_client(verify).stream(
+                'GET', url, headers=request_headers, timeout=health.timeout_for(host, timeout)
+            ) as streamed:
+                health.record(host, streamed.status_code, time.monotonic() - started)
+                response = _read_capped(url, streamed, max_bytes, content_types)
+        except HOST_FAILURES:
+            health.record_failure(host)
+            raise
+    return _apply_cache(cache, entry, url, response)
+
+
+def _loop_state() -> dict:
+    loop = asyncio.get_running_loop()
+    state = _async_state.get(loop)
+    if state is None:
+        state = {'clients': {}, 'semaphores': {}}
+        _async_state[loop] = state
+    return state
+
+
+def get_async_client(verify: bool = True) -> httpx.AsyncClient:
+    """
+    Returns the pooled async client bound to the running event loop.
+    Call aclose() before the loop finishes to release its connections.
+    """
+    clients = _loop_state()['clients']
+    client = clients.get(verify)
+    if client is None:
+        client = httpx.AsyncClient(**_client_kwargs(verify))
+        clients[verify] = client
+    return client
+
+
+async def get_async(
+    url: str,
+    headers: Optional[dict] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    verify: bool = True,
+    use_cache: bool = True,
+    max_bytes: int = MAX_PAGE_BYTES,
+    content_types: Optional[Iterable[str]] = None
+) -> httpx.Response:
+    """
+    Async counterpart of get(), sharing one pool per event loop.
+    """
+    cache = http_cache.get_cache() if use_cache else None
+    entry = await asyncio.to_thread(cache.lookup, url) if cache else None
+    if entry is not None and entry.is_fresh(cache.ttl):
+        _check_content_type(url, entry.content_type or '', content_types)
+        return entry.to_response(url)
+
+    host = _host_of(url)
+    health = get_host_health()
+    health.check(host)
+    semaphores = _loop_state()['semaphores']
+    semaphore = semaphores.setdefault(host, asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST))
+    async with semaphore:
+        request_headers = _conditional_headers(headers, entry)
+        started = time.monotonic()
+        try:
+            async with get_async_client(verify).stream(
+                'GET', url, headers=request_headers, timeout=health.timeout_for(host, timeout)
+            ) as streamed:
+                health.record(host, streamed.status_code, time.monotonic() - started)
+                response = await _read_capped_async(url, streamed, max_bytes, content_types)
+        except HOST_FAILURES:
+            health.record_failure(host)
+            raise
+    return await asyncio.to_thread(_apply_cache, cache, entry, url, response)
+
+
+async def aclose():
+    """
+    Closes the async clients of the running event loop.
+    """
+    state = _async_state.pop(asyncio.get_running_loop(), None)
+    if state:
+        for client in state['clients'].values():
+            await client.aclose()
@@ -0,0 +1,167 @@
+#link_graph.py
+
+from array import array
+
+
+class LinkGraph:
+    """
+    Directed link graph of a crawl, stored compactly.
+
+    URLs are interned once to consecutive integer ids; edges are two
+    parallel arrays of ids, and the level of every node (0 for crawl
+    roots, parent level + 1 for discovered links) is recorded when the node
+    is inserted. Compressed sparse row adjacency is built on demand and
+    cached until the next edge is added. Use to_networkx() when a networkx
+    graph is really needed.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.urls = []
+        self.levels = array('l')
+        self.sources = array('L')
+        self.targets = array('L')
+        self._csr = {}
+
+    def __len__(self):
+        return len(self.urls)
+
+    def __contains__(self, url):
+        return url in self.ids
+
+    def number_of_nodes(self):
+        return len(self.urls)
+
+    def number_of_edges(self):
+        return len(self.sources)
+
+    def add_node(self, url, level=0):
+        """
+        Interns a URL, recording its level if it is new.
+
+        :return: The id of the URL.
+        """
+        node = self.ids.get(url)
+        if node is None:
+            node = self.ids[url] = len(self.urls)
+            self.urls.append(url)
+            self.levels.append(level)
+        return node
+
+    def add_edge(self, source_url, target_url):
+        """
+        Adds a link. A new source is a root (level 0); a new target gets the
+        level of the source plus one.
+        """
+        source = self.add_node(source_url)
+        target = self.add_node(target_url, self.levels[source] + 1)
+        self.sources.append(source)
+        self.targets.append(target)
+        self._csr.clear()
+        return source, target
+
+    def id_of(self, url):
+        return self.ids[url]
+
+    def url_of(self, node):
+        return self.urls[node]
+
+    def level_of(self, url):
+        return self.levels[self.ids[url]]
+
+    def nodes(self):
+        return list(self.urls)
+
+    def edges(self):
+        """The links as (source url, target url) pairs, in insertion order."""
+        urls = self.urls
+        return [(urls[source], urls[target]) for source, target in zip(self.sources, self.targets)]
+
+    def csr(self, reverse=False):
+        """
+        Adjacency in compressed sparse row form: the neighbours of node i are
+        indices[indptr[i]:indptr[i + 1]].
+
+        :param reverse: Index incoming instead of outgoing links.
+        :return: (indptr, indices) arrays.
+        """
+        cached = self._csr.get(reverse)
+        if cached is not None:
+            return cached
+        rows, columns = (self.targets, self.sources) if reverse else (self.sources, self.targets)
+        count = len(self.urls)
+        indptr = array('L', [0]) * (count + 1)
+        for row in rows:
+            indptr[row + 1] += 1
+        for i in range(count):
+            indptr[i + 1] += indptr[i]
+        fill = array('L', indptr[:-1])
+        indices = array('L', [0]) * len(rows)
+        for row, column in zip(rows, columns):
+            indices[fill[row]] = column
+            fill[row] += 1
+        self._csr[reverse] = indptr, indices
+        return indptr, indices
+
+    def successors(self, url):
+        indptr, indices = self.csr()
+        node = self.ids[url]
+        return [self.urls[i] for i in indices[indptr[node]:indptr[node + 1]]]
+
+    def predecessors(self, url):
+        indptr, indices = self.csr(reverse=True)
+        node = self.ids[url]
+        return [self.urls[i] for i in indices[indptr[node]:indptr[node + 1]]]
+
+    def pagerank(self, damping=0.85, iterations=50, tolerance=1e-6):
+        """
+        PageRank of every node by power iteration over the CSR adjacency.
+        The rank of pages without outgoing links is spread over all pages.
+
+        :return: List of ranks by node id, summing to 1.
+        """
+        count = len(self.urls)
+        if not count:
+            return []
+        indptr, indices = self.csr()
+        out_degrees = [indptr[i + 1] - indptr[i] for i in range(count)]
+        rank = [1.0 / count] * count
+        for _ in range(iterations):
+            dangling = sum(rank[i] for i in range(count) if not out_degrees[i])
+            new_rank = [(1 - damping) / count + damping * dangling / count] * count
+            for i in range(count):
+                if out_degrees[i]:
+                    share = damping * rank[i] / out_degrees[i]
+                    for j in indices[indptr[i]:indptr[i + 1]]:
+                        new_rank[j] += share
+            delta = sum(abs(new - old) for new, old in zip(new_rank, rank))
+            rank = new_rank
+            if delta < tolerance:
+                break
+        return rank
+
+    def in_degrees(self):
+        """Array of the number of incoming links of every node, by id."""
+        degrees = array('L', [0]) * len(self.urls)
+        for target in self.targets:
+            degrees[target] += 1
+        return degrees
+
+    def to_networkx(self):
+        """The graph as a networkx.DiGraph keyed by URL, with the level as node attribute."""
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from((url, {'level': level}) for url, level in zip(self.urls, self.levels))
+        graph.add_edges_from(self.edges())
+        return graph
+
+    def node_link_data(self):
+        """JSON-serializable dict in the networkx node-link format."""
+        return {
+            'directed': True,
+            'multigraph': False,
+            'graph': {},
+            'nodes': [{'id': url, 'level': level} for url, level in zip(self.urls, self.levels)],
+            'links': [{'source': source, 'target': target} for source, target in self.edges()],
+        }
@@ -0,0 +1,290 @@
+#llm_client.py
+
+import atexit
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, NamedTuple, Optional
+import httpx
+from config import (
+    GPT_API_URL, GPT_API_KEY, GEMINI_API_URL, GEMINI_API_KEY, COHERE_CHAT_URL, COHERE_API_KEY, COHERE_MODEL,
+    OLLAMA_API_URL, OLLAMA_MODEL, OLLAMA_PROBE_INTERVAL, LLM_TIMEOUTS, LLM_RETRIES, LLM_BACKOFF, LLM_BACKOFF_MAX,
+    LLM_DEADLINES, FETCH_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 10
+MAX_CONNECTIONS = 20
+# Answers worth retrying: rate limits, timeouts and server-side failures
+RETRY_STATUSES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class Request(NamedTuple):
+    url: str
+    headers: dict
+    params: Optional[dict]
+    payload: dict
+
+
+class Provider(NamedTuple):
+    # Label of the provider's answer in combined responses
+    label: str
+    build: Callable[..., Request]
+    parse: Callable[[dict], Optional[str]]
+
+
+def _gpt_request(prompt, model="gpt-4o-mini", max_tokens=2000, temperature=0.7):
+    return Request(
+        GPT_API_URL,
+        {"Authorization": f"Bearer {GPT_API_KEY}"},
+        None,
+        {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        },
+    )
+
+
+def _gpt_text(data):
+    return data['choices'][0]['message']['content']
+
+
+def _gemini_request(prompt):
+    payload = {"contents": [{"parts": [{"text": prompt}]}]}
+    return Request(GEMINI_API_URL, {}, {'key': GEMINI_API_KEY}, payload)
+
+
+def _gemini_text(data):
+    return data['candidates'][0]['content']['parts'][0].get('text')
+
+
+def _cohere_request(prompt, temperature=0.3):
+    return Request(
+        COHERE_CHAT_URL,
+        {"Authorization": f"Bearer {COHERE_API_KEY}"},
+        None,
+        {
+            "model": COHERE_MODEL,
+            "message": prompt,
+            "temperature": temperature,
+            "chat_history": [],
+            "prompt_truncation": "AUTO",
+            "connectors": [{"id": "web-search"}],
+        },
+    )
+
+
+def _cohere_text(data):
+    return data['text']
+
+
+def _ollama_request(prompt, model=OLLAMA_MODEL, options=None):
+    payload = {"model": model, "prompt": prompt, "stream": False}
+    if options:
+        payload["options"] = options
+    return Request(OLLAMA_API_URL, {}, None, payload)
+
+
+def _ollama_text(data):
+    return data['response']
+
+
+PROVIDERS: Dict[str, Provider] = {
+    'ollama': Provider('Ollama', _ollama_request, _ollama_text),
+    'cohere': Provider('Cohere', _cohere_request, _cohere_text),
+    'gpt': Provider('GPT', _gpt_request, _gpt_text),
+    'gemini': Provider('Gemini', _gemini_request, _gemini_text),
+}
+
+# Providers given generate_response's temperature; the others keep their server default
+TEMPERATURE_PROVIDERS = ('cohere', 'gpt')
+# Threads querying providers concurrently, shared by every generate_response call:
+# enough for every provider of FETCH_WORKERS concurrent callers
+FANOUT_WORKERS = FETCH_WORKERS * len(PROVIDERS)
+
+_lock = threading.Lock()
+_clients: Dict[str, httpx.Client] = {}
+_executor: Optional[ThreadPoolExecutor] = None
+# Last reachability check of the Ollama server: (up, time.monotonic() of the check)
+_ollama_probe: Optional[tuple] = None
+
+
+def get_client(provider: str) -> httpx.Client:
+    """The keep-alive connection pool of a provider, created on first use and reused by every call."""
+    with _lock:
+        client = _clients.get(provider)
+        if client is None:
+            client = _clients[provider] = httpx.Client(
+                headers={'Content-Type': 'application/json'},
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            )
+        return client
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix='llm')
+        return _executor
+
+
+def close():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+atexit.register(close)
+
+
+def ollama_available() -> bool:
+    """
+    Whether the local Ollama server accepts connections. The answer is kept
+    for OLLAMA_PROBE_INTERVAL seconds, so with no server running each call
+    costs nothing instead of a full round of retries.
+    """
+    global _ollama_probe
+    if _ollama_probe is not None and time.monotonic() - _ollama_probe[1] < OLLAMA_PROBE_INTERVAL:
+        return _ollama_probe[0]
+    try:
+        # Any answer means the server is up; the root path replies "Ollama is running"
+        get_client('ollama').get(
+            str(httpx.URL(OLLAMA_API_URL).copy_with(path='/')), timeout=httpx.Timeout(CONNECT_TIMEOUT)
+        )
+        up = True
+    except httpx.TransportError as e:
+        logger.warning(f"Ollama server unreachable ({type(e).__name__}), skipping Ollama for {OLLAMA_PROBE_INTERVAL} seconds.")
+        up = False
+    _ollama_probe = (up, time.monotonic())
+    return up
+
+
+def backoff_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before retry number attempt + 1: the server's Retry-After if given, else jittered exponential backoff."""
+    if response is not None:
+        try:
+            return min(float(response.headers.get('retry-after', '')), LLM_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return min(LLM_BACKOFF * 2 ** attempt, LLM_BACKOFF_MAX) * random.uniform(0.5, 1.0)
+
+
+def generate(
+    provider: str,
+    prompt: str,
+    timeout: Optional[float] = None,
+    retries: int = LLM_RETRIES,
+    deadline: Optional[float] = None,
+    ends_at: Optional[float] = None,
+    **options
+) -> Optional[str]:
+    """
+    Generates text with one provider through its pooled connection.
+
+    Transport errors and retryable answers (429, 5xx, ...) are retried with
+    backoff; other errors end the call at once. Ollama is skipped while its
+    server is unreachable (see ollama_available).
+
+    Args:
+        provider (str): 'gpt', 'gemini', 'cohere' or 'ollama'.
+        prompt (str): The input prompt.
+        timeout (Optional[float]): Seconds per attempt; defaults to the provider's LLM_TIMEOUTS entry.
+        retries (int): Number of attempts.
+        deadline (Optional[float]): Seconds for the whole call, retries and backoff included; None for no limit.
+        ends_at (Optional[float]): The same limit as a time.monotonic() instant, for calls queued before they start.
+        **options: Provider parameters, e.g. model, temperature, max_tokens.
+
+    Returns:
+        Optional[str]: The generated text, or None if every attempt failed.
+    """
+    spec = PROVIDERS[provider]
+    if provider == 'ollama' and not ollama_available():
+        return None
+    request = spec.build(prompt, **options)
+    timeout = timeout or LLM_TIMEOUTS[provider]
+    if ends_at is None and deadline:
+        ends_at = time.monotonic() + deadline
+    client = get_client(provider)
+
+    for attempt in range(retries):
+        response = None
+        # No attempt may run past the deadline
+        attempt_timeout = min(timeout, ends_at - time.monotonic()) if ends_at else timeout
+        if attempt_timeout <= 0:
+            logger.error(f"{spec.label} gave up after {attempt} attempts: deadline reached.")
+            break
+        try:
+            response = client.post(
+                request.url, headers=request.headers, params=request.params, json=request.payload,
+                timeout=httpx.Timeout(attempt_timeout, connect=min(CONNECT_TIMEOUT, attempt_timeout))
+            )
+            if response.status_code < 400:
+                return spec.parse(response.json())
+            if response.status_code not in RETRY_STATUSES:
+                logger.error(f"{spec.label} answered {response.status_code}: {response.text[:200]}")
+                return None
+            error = f"HTTP {response.status_code}"
+        except httpx.TransportError as e:
+            error = f"{type(e).__name__}: {e}"
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            logger.error(f"Unexpected {spec.label} response: {type(e).__name__}: {e}")
+            return None
+
+        delay = backoff_delay(attempt, response)
+        if ends_at and time.monotonic() + delay >= ends_at:
+            logger.error(f"{spec.label} gave up after {attempt + 1} attempts: deadline reached ({error}).")
+            break
+        if attempt < retries - 1:
+            logger.warning(f"{spec.label} attempt {attempt + 1}/{retries} failed ({error}), retrying in {delay:.1f} seconds.")
+            time.sleep(delay)
+        else:
+            logger.error(f"{spec.label} failed after {retries} attempts ({error}).")
+    return None
+
+
+def generate_response(prompt, use_ollama, use_cohere, use_gpt, use_gemini, temperature=0.7):
+    """
+    Generates a response using selected AI models based on the provided flags.
+    The selected models are queried concurrently, each within its own
+    LLM_DEADLINES entry counted from submission, so a slow model does not
+    hold back the others and time spent queued for a thread counts too.
+
+    :param prompt: The text prompt to pass to the AI models.
+    :param use_ollama, use_cohere, use_gpt, use_gemini: Flags indicating which AI models to use.
+    :param temperature: Sampling temperature passed to Cohere and GPT; Ollama and Gemini use their defaults.
+    :return: A combined response string from the selected models, one "<Model>: <text>" line each,
+        always in the order Ollama, Cohere, GPT, Gemini.
+    """
+    selected = {'ollama': use_ollama, 'cohere': use_cohere, 'gpt': use_gpt, 'gemini': use_gemini}
+    providers = [provider for provider, use in selected.items() if use]
+    if not providers:
+        return "Nessun modello selezionato."
+
+    options = {
+        provider: {'temperature': temperature} if provider in TEMPERATURE_PROVIDERS else {}
+        for provider in providers
+    }
+    if len(providers) == 1:
+        texts = [generate(providers[0], prompt, deadline=LLM_DEADLINES[providers[0]], **options[providers[0]])]
+    else:
+        executor = get_executor()
+        submitted = time.monotonic()
+        futures = [
+            executor.submit(
+                generate, provider, prompt, ends_at=submitted + LLM_DEADLINES[provider], **options[provider]
+            )
+            for provider in providers
+        ]
+        texts = [future.result() for future in futures]
+    return "\n".join(f"{PROVIDERS[provider].label}: {text}" for provider, text in zip(providers, texts))
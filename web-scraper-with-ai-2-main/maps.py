@@ -2,8 +2,9 @@
 
 from use_azure_maps import *
 import folium
-from selenium import webdriver
-import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from browser_profile import launch_chrome
 import os
 import glob
 from IPython.display import Image, display
@@ -13,6 +14,23 @@ from ollama import generate_with_ollama
 from cohere_api import generate_with_cohere
 from gemini import generate_with_gemini
 
+# Secondi massimi di attesa per il caricamento delle tile di una mappa
+MAP_TILES_TIMEOUT = 15
+TILES_LOADED_SCRIPT = (
+    "var tiles = document.querySelectorAll('img.leaflet-tile');"
+    "return tiles.length > 0 && Array.prototype.every.call(tiles, function (tile) { return tile.complete; });"
+)
+
+def wait_for_tiles(driver, timeout=MAP_TILES_TIMEOUT):
+    """
+    Attende che tutte le tile della mappa Leaflet siano caricate, invece di un'attesa fissa.
+    Allo scadere del timeout lo screenshot viene comunque salvato.
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(lambda d: d.execute_script(TILES_LOADED_SCRIPT))
+    except TimeoutException:
+        print(f"Tile non caricate entro {timeout} secondi, salvo lo screenshot parziale.")
+
 def generate_map_tiles_and_process(
     lat_center, lon_center, area_width_m, area_height_m,
     zoom_level, map_width_px, map_height_px,
@@ -45,7 +63,9 @@ def generate_map_tiles_and_process(
     for file in old_files:
         os.remove(file)
 
-    driver = webdriver.Chrome()
+    # Profilo headless condiviso, ma senza bloccare le immagini: servono le tile satellitari
+    driver = launch_chrome(block_resources=False, window_size=(map_width_px, map_height_px))
+    driver.set_window_size(map_width_px, map_height_px)
 
     try:
         # Genera mappe e salva gli screenshot
@@ -70,9 +90,8 @@ def generate_map_tiles_and_process(
 
                 # Carica la mappa e salva lo screenshot come PNG nella directory statica
                 driver.get(map_path)
-                time.sleep(2)
+                wait_for_tiles(driver)
                 screenshot_filename = os.path.join(static_folder, f'map_{i}_{j}.png')
-                driver.set_window_size(map_width_px, map_height_px)
                 driver.save_screenshot(screenshot_filename)
 
                 # Rimuovi il file HTML temporaneo
@@ -0,0 +1,100 @@
+#near_duplicates.py
+
+import hashlib
+import re
+from collections import Counter
+
+FINGERPRINT_BITS = 64
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def simhash(text, shingle_size=3):
+    """
+    64-bit SimHash of a text over word shingles. Texts that share most of
+    their shingles end up a few bits apart in Hamming distance.
+
+    :param text: The extracted page text.
+    :param shingle_size: Number of consecutive words per shingle.
+    :return: The fingerprint as an int.
+    """
+    words = WORD_RE.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = Counter([' '.join(words)])
+    else:
+        shingles = Counter(' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if h >> bit & 1 else -count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class NearDuplicateDetector:
+    """
+    Finds pages whose SimHash is within max_distance bits of a page seen
+    before. The fingerprint is split into max_distance + 1 bands: two
+    fingerprints that close must agree on at least one band, so only pages
+    sharing a band are compared.
+    """
+
+    def __init__(self, max_distance=3, shingle_size=3):
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+        self.band_count = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.band_count
+        self.bands = [{} for _ in range(self.band_count)]
+        self.skipped = 0
+
+    def band_values(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (i * self.band_bits)) & mask for i in range(self.band_count)]
+
+    def find(self, fingerprint):
+        for band, value in zip(self.bands, self.band_values(fingerprint)):
+            for other, key in band.get(value, ()):
+                if bin(fingerprint ^ other).count('1') <= self.max_distance:
+                    return key
+        return None
+
+    def check(self, key, text):
+        """
+        Registers a page unless it is a near duplicate of one already registered.
+
+        :param key: Identifier of the page, usually its URL.
+        :param text: The page text.
+        :return: The key of the earlier page it duplicates, or None if it is new.
+        """
+        fingerprint = simhash(text, self.shingle_size)
+        original = self.find(fingerprint)
+        if original is not None:
+            self.skipped += 1
+            return original
+        for band, value in zip(self.bands, self.band_values(fingerprint)):
+            band.setdefault(value, []).append((fingerprint, key))
+        return None
+
+
+def collapse_near_duplicates(texts, max_distance=3):
+    """
+    Keeps one representative per cluster of near-identical texts.
+
+    :param texts: Dict of key -> text, in priority order.
+    :param max_distance: Maximum Hamming distance between duplicate fingerprints.
+    :return: (dict of representatives in original order, dict of skipped key -> representative key)
+    """
+    detector = NearDuplicateDetector(max_distance)
+    unique, duplicates = {}, {}
+    for key, text in texts.items():
+        original = detector.check(key, text)
+        if original is None:
+            unique[key] = text
+        else:
+            duplicates[key] = original
+    return unique, duplicates
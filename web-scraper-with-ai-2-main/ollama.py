@@ -1,6 +1,15 @@
 # ollama.py
-import requests
-from config import OLLAMA_API_URL
+from typing import Optional
+from config import OLLAMA_MODEL
+import llm_client
 
-def generate_with_ollama(prompt: str, options: dict = None):
-    return "ciao"
\ No newline at end of file
+def generate_with_ollama(prompt: str, options: dict = None, model: str = OLLAMA_MODEL) -> Optional[str]:
+    """
+    Generate text with a local Ollama server (/api/generate, without streaming).
+
+    :param prompt: The input prompt.
+    :param options: Ollama model options, e.g. {'temperature': 0.7, 'num_ctx': 4096}.
+    :param model: The Ollama model to use.
+    :return: The generated text, or None if the server is unreachable or fails.
+    """
+    return llm_client.generate('ollama', prompt, model=model, options=options)
@@ -0,0 +1,112 @@
+#parse_pool.py
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple, Union
+from html_extraction import Anchor, parse_page, parse_page_anchors
+from config import PARSE_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_lock = threading.Lock()
+
+
+def _mp_context():
+    # Forking a process that runs threads (Flask, the driver pool, the LLM
+    # executor) can copy a held lock into the child; forkserver children
+    # start from a clean single-threaded server instead.
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['html_extraction'])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def get_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Returns the shared parsing process pool, starting it on first use.
+    Returns None when PARSE_WORKERS is 0, in which case parsing stays in-process.
+    """
+    global _pool
+    if PARSE_WORKERS == 0:
+        return None
+    with _lock:
+        if _pool is None:
+            workers = PARSE_WORKERS or os.cpu_count() or 1
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context())
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+            logger.info(f"Started HTML parsing pool with {workers} processes.")
+        return _pool
+
+
+def prewarm():
+    """Starts the parsing processes in the background so the first pages do not wait for them."""
+    pool = get_pool()
+    if pool is None:
+        return
+    # Processes are started on demand: one pending task per worker starts them all
+    for _ in range(pool._max_workers):
+        pool.submit(os.getpid)
+
+
+def _reset_pool():
+    global _pool
+    with _lock:
+        _pool = None
+
+
+def parse(
+    html: Union[str, bytes],
+    base_url: Optional[str] = None,
+    main_content: bool = False,
+    backend: Optional[str] = None,
+    encoding: Optional[str] = None
+) -> Tuple[str, List[str]]:
+    """
+    Runs html_extraction.parse_page in a worker process and waits for it.
+    Only the text and the links come back, never a parse tree. Pass the
+    response's header charset as encoding when html is bytes.
+    """
+    pool = get_pool()
+    if pool is None:
+        return parse_page(html, base_url, main_content, backend, encoding)
+    try:
+        return pool.submit(parse_page, html, base_url, main_content, backend, encoding).result()
+    except BrokenProcessPool:
+        logger.error("HTML parsing pool broke, parsing in-process.")
+        _reset_pool()
+        return parse_page(html, base_url, main_content, backend, encoding)
+
+
+async def parse_anchors_async(
+    html: Union[str, bytes],
+    base_url: str,
+    main_content: bool = False,
+    backend: Optional[str] = None,
+    encoding: Optional[str] = None
+) -> Tuple[str, List[Anchor]]:
+    """
+    Awaitable html_extraction.parse_page_anchors() in a worker process:
+    the event loop keeps fetching while workers parse.
+    """
+    return await _run_async(parse_page_anchors, html, base_url, main_content, backend, encoding)
+
+
+async def _run_async(func, *args):
+    pool = get_pool()
+    if pool is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        logger.error("HTML parsing pool broke, parsing in-process.")
+        _reset_pool()
+        return func(*args)
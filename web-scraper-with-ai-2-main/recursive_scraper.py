@@ -1,32 +1,229 @@
 #recursive_scraper.py
 
-import requests
-import time
+import asyncio
 import random
-import re
-import os
-import json
 import logging
-import networkx as nx
-from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+import time
 from transformers import pipeline, BartTokenizer
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
 from config import PROMPT_SCRAPER_SUMMARIZE
 from gpt_api import generate_with_gpt
+from host_scheduler import HostScheduler
+import http_client
+from exceptions import ContentTooLargeError, UnsupportedContentError, CircuitOpenError
+from host_health import get_host_health
+from robots_cache import RobotsCache
+from url_utils import VisitedSet, canonicalize_url
+from near_duplicates import collapse_near_duplicates
+from frontier import Frontier, LinkScorer
+from link_graph import LinkGraph
+import parse_pool
 
 logger = logging.getLogger(__name__)
 
+# Score of the seed URLs, the highest a link can get
+SEED_SCORE = 1.0
+
 class RecursiveScraper:
-    def __init__(self, config):
+    def __init__(self, config, checkpoint=None):
         self.config = config
-        self.visited_urls = set()
+        # Optional CrawlCheckpoint: the crawl state is saved to it and restored from it
+        self.checkpoint = checkpoint
+        self.visited_urls = VisitedSet(config.visited_bloom_capacity)
         self.text_data = {}
         self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
-        self.graph = nx.DiGraph()
+        self.graph = LinkGraph()
+        self.scheduler = HostScheduler(
+            config.min_delay, config.max_delay, config.max_requests_per_host
+        )
+        self.duplicate_pages = {}
+        self.scorer = LinkScorer(config.query)
+        # Query relevance of every page fetched, between 0 and 1
+        self.page_scores = {}
+        self.pages_started = 0
+        self.health = get_host_health()
+        self.unhealthy_skipped = 0
+        self.robots = RobotsCache()
+        self.discovered_hosts = set()
+        self.robots_skipped = 0
+
+    def crawl(self, seed_urls):
+        """
+        Crawls from the seed URLs, best-first: links are scored against
+        config.query (anchor text, URL, surrounding text and the relevance
+        of the page they were found on) and the highest-scoring ones are
+        fetched first, until config.max_pages pages have been fetched. Up
+        to config.max_concurrency pages are fetched in parallel and
+        politeness delays are enforced per host by the HostScheduler.
+
+        With a checkpoint, a previously saved crawl is restored first and
+        only the pages it had not fetched yet are scraped.
+
+        :param seed_urls: URLs to start from, scraped at depth 1.
+        """
+        asyncio.run(self.crawl_async(seed_urls))
+
+    async def crawl_async(self, seed_urls):
+        queue = Frontier()
+        self.scheduler.on_ready = lambda item: self.requeue(queue, item)
+        for url, depth, score in self.restore():
+            queue.push(url, depth, score)
+        for url in seed_urls:
+            self.enqueue(queue, canonicalize_url(url), 1)
+
+        workers = [
+            asyncio.create_task(self.worker(queue))
+            for _ in range(max(1, self.config.max_concurrency))
+        ]
+        completed = False
+        try:
+            await queue.join()
+            completed = True
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.scheduler.cancel_wakeups()
+            await http_client.aclose()
+            if self.checkpoint is not None:
+                if completed:
+                    self.checkpoint.finish()
+                else:
+                    self.checkpoint.flush()
+
+        logger.info(
+            f"Crawl finished: {len(self.visited_urls)} URLs visited, {len(self.text_data)} pages with text, "
+            f"{self.unhealthy_skipped} URLs on unhealthy hosts and {self.robots_skipped} disallowed by robots.txt skipped."
+        )
+
+    def restore(self):
+        """
+        Loads the saved state of the checkpointed job, if any.
+
+        :return: The (url, depth, score) entries of the frontier that still have to be fetched.
+        """
+        if self.checkpoint is None or not self.checkpoint.has_state():
+            return []
+
+        nodes, pages = self.checkpoint.load()
+        frontier = []
+        for url, depth, parent_url, score in nodes:
+            self.visited_urls.add(url)
+            if parent_url:
+                self.graph.add_edge(parent_url, url)
+            else:
+                self.graph.add_node(url, depth - 1)
+            if url not in pages:
+                frontier.append((url, depth, score))
+        for source, target in self.checkpoint.load_links():
+            self.graph.add_edge(source, target)
+        self.text_data.update((url, text) for url, text in pages.items() if text)
+        self.page_scores.update((url, self.scorer.page_score(text)) for url, text in self.text_data.items())
+        self.pages_started = len(pages)
+        logger.info(
+            f"Resumed job {self.checkpoint.job_id}: {len(pages)} pages already fetched, "
+            f"{len(frontier)} left in the frontier."
+        )
+        return frontier
 
-    def fetch(self, url):
+    def enqueue(self, queue, url, depth, parent_url=None, score=SEED_SCORE):
+        if not self.visited_urls.add(url):
+            return
+
+        if parent_url:
+            self.graph.add_edge(parent_url, url)
+        else:
+            self.graph.add_node(url, depth - 1)
+        if self.checkpoint is not None:
+            self.checkpoint.add_node(url, depth, parent_url, score)
+
+        queue.push(url, depth, score)
+
+    async def check_robots(self, queue, url, depth):
+        """
+        Checks a URL against the robots.txt of its host, fetched once per host.
+        The first time a host is seen its Crawl-delay goes to the scheduler and
+        the frontier is seeded from its sitemap.
+
+        :return: Whether robots.txt allows fetching the URL.
+        """
+        rules = await self.robots.get(url)
+        host = self.scheduler.host_of(url)
+        if host not in self.discovered_hosts:
+            self.discovered_hosts.add(host)
+            self.scheduler.set_crawl_delay(host, rules.crawl_delay())
+            if self.config.sitemap_seeds and depth < self.config.recursion_depth:
+                await self.seed_from_sitemap(queue, url, depth + 1)
+        return rules.allowed(url)
+
+    async def seed_from_sitemap(self, queue, url, depth):
+        """
+        Enqueues the sitemap URLs of the host of url whose path matches the
+        query best, up to config.sitemap_seeds of them. This reaches deep
+        relevant pages without fetching the navigation pages leading there.
+        """
+        scored = {}
+        for link in await self.robots.sitemap_urls(url):
+            link = canonicalize_url(link)
+            if link not in scored and link not in self.visited_urls:
+                scored[link] = self.scorer.url_score(link)
+        ranked = sorted(((score, link) for link, score in scored.items() if score > 0), reverse=True)
+        for score, link in ranked[:self.config.sitemap_seeds]:
+            self.enqueue(queue, link, depth, score=score)
+        if ranked:
+            logger.info(f"Seeded {min(len(ranked), self.config.sitemap_seeds)} URLs from the sitemap of {self.scheduler.host_of(url)}.")
+
+    async def save_checkpoint(self):
+        if self.checkpoint is None or not self.checkpoint.should_flush():
+            return
+        # Take the batch on the loop thread, write it off the loop
+        batch = self.checkpoint.take_batch()
+        await asyncio.to_thread(self.checkpoint.write, batch)
+
+    async def worker(self, queue):
+        while True:
+            item = await queue.get()
+            _, depth, _, url = item
+            if self.config.max_pages is not None and self.pages_started >= self.config.max_pages:
+                # Page budget spent: drain the rest of the frontier without fetching
+                self.scheduler.skip(url)
+                queue.task_done()
+                continue
+            if self.health.is_open(self.scheduler.host_of(url)):
+                # Host circuit is open: skip the entry instead of waiting on a dead host
+                self.unhealthy_skipped += 1
+                self.scheduler.skip(url)
+                queue.task_done()
+                continue
+            if self.config.respect_robots and not await self.check_robots(queue, url, depth):
+                self.robots_skipped += 1
+                self.scheduler.skip(url)
+                queue.task_done()
+                continue
+            if self.scheduler.reserve(url) > 0:
+                # Host is busy or cooling down: park the entry with the host's other waiting
+                # entries and serve other hosts meanwhile. It stays unfinished in the queue.
+                self.scheduler.park(url, item)
+                continue
+            self.pages_started += 1
+            try:
+                await self.scrape_page(queue, url, depth)
+            except CircuitOpenError as e:
+                # Not checkpointed as fetched, so a resumed crawl tries it again
+                logger.debug(f"Skipping {url}: {e}")
+                self.unhealthy_skipped += 1
+            except Exception as e:
+                logger.error(f"Error scraping {url} at depth {depth}: {e}")
+            finally:
+                self.scheduler.release(url)
+                queue.task_done()
+
+    @staticmethod
+    def requeue(queue, item):
+        # Back into the frontier, where it competes by score with the other hosts' entries
+        queue.put_nowait(item)
+        queue.task_done()
+
+    async def fetch(self, url):
         retries = 0
         while retries < self.config.max_retries:
             try:
@@ -36,74 +233,129 @@ class RecursiveScraper:
                     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
                     'Referer': 'https://www.google.com/'
                 }
-                response = requests.get(url, headers=headers, timeout=self.config.timeout)
-                if response.status_code == 200 and 'text/html' in response.headers.get('content-type', ''):
-                    time.sleep(random.uniform(self.config.min_delay, self.config.max_delay))
+                response = await http_client.get_async(
+                    url, headers=headers, timeout=self.config.timeout,
+                    max_bytes=self.config.max_page_bytes, content_types=http_client.HTML_TYPES
+                )
+                if response.status_code == 200:
                     return response.text
                 else:
-                    logger.debug(f"Non-HTML content or invalid status code for {url}")
+                    logger.debug(f"Invalid status code {response.status_code} for {url}")
                     return None
+            except (ContentTooLargeError, UnsupportedContentError) as e:
+                logger.debug(f"Skipping {url}: {e}")
+                return None
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 retries += 1
                 delay = random.uniform(self.config.min_delay, self.config.max_delay)
                 logger.warning(f"Error fetching {url}: {e}. Retrying in {delay:.2f} seconds...")
-                time.sleep(delay)
+                await asyncio.sleep(delay)
         logger.error(f"Failed to fetch {url} after {self.config.max_retries} retries.")
         return None
 
-    def scrape_page(self, url, current_depth, parent_url=None):
-        if url in self.visited_urls:
-            return
-        self.visited_urls.add(url)
+    async def scrape_page(self, queue, url, current_depth):
         logger.info(f"Scraping {url} at depth {current_depth}")
 
-        if parent_url:
-            self.graph.add_edge(parent_url, url)
-        else:
-            self.graph.add_node(url)
-
-        html = self.fetch(url)
+        html = await self.fetch(url)
         if html is None:
+            if self.checkpoint is not None:
+                self.checkpoint.add_page(url, None)
             return
 
-        soup = BeautifulSoup(html, 'html.parser')
-        text = self.extract_text(soup)
+        text, anchors = await parse_pool.parse_anchors_async(
+            html, url, self.config.main_content, self.config.html_parser
+        )
         if text:
             self.text_data[url] = text
+        page_score = self.page_scores[url] = self.scorer.page_score(text)
 
         if current_depth < self.config.recursion_depth:
-            links = self.extract_links(soup, url)
-            random.shuffle(links)
-            for link in links[:self.config.max_links_per_page]:
-                self.scrape_page(link, current_depth + 1, parent_url=url)
-
-    def extract_text(self, soup):
-        for script_or_style in soup(['script', 'style', 'noscript']):
-            script_or_style.decompose()
-        text = soup.get_text(separator=' ')
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-
-    def extract_links(self, soup, base_url):
-        links = []
-        for a_tag in soup.find_all('a', href=True):
-            href = a_tag['href']
-            href = urljoin(base_url, href)
-            parsed_href = urlparse(href)
-            if parsed_href.scheme in ('http', 'https') and href not in self.visited_urls:
-                links.append(href)
-        return links
+            for link, score in self.rank_links(url, anchors, page_score)[:self.config.max_links_per_page]:
+                self.enqueue(queue, link, current_depth + 1, parent_url=url, score=score)
+
+        # Recorded after its links, so a checkpoint never holds a page without its children
+        if self.checkpoint is not None:
+            self.checkpoint.add_page(url, text or None)
+        await self.save_checkpoint()
+
+    def rank_links(self, url, anchors, page_score):
+        """
+        Canonicalizes the links of a page, drops the ones already visited and
+        scores the rest against the query. A URL linked several times keeps
+        its best score. Links to pages already in the graph are added to it
+        as edges, so that link analysis sees more than the discovery tree.
+
+        :return: List of (url, score), highest score first.
+        """
+        scores = {}
+        known = set()
+        for anchor in anchors:
+            href = canonicalize_url(anchor.url)
+            if href in self.visited_urls:
+                if href != url and href in self.graph and href not in known:
+                    known.add(href)
+                    self.graph.add_edge(url, href)
+                    if self.checkpoint is not None:
+                        self.checkpoint.add_link(url, href)
+                continue
+            score = self.scorer.score(anchor, page_score)
+            if score > scores.get(href, -1.0):
+                scores[href] = score
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def rank_pages(self):
+        """
+        Orders the pages with text by importance: PageRank on the link graph,
+        scaled to the best page, weighted by config.pagerank_weight against
+        the query relevance of the page.
+
+        :return: List of URLs, best first.
+        """
+        ranks = self.graph.pagerank()
+        top_rank = max(ranks, default=0.0) or 1.0
+        weight = self.config.pagerank_weight
+
+        def score(url):
+            rank = ranks[self.graph.id_of(url)] / top_rank if url in self.graph else 0.0
+            return weight * rank + (1 - weight) * self.page_scores.get(url, 0.0)
+
+        return sorted(self.text_data, key=score, reverse=True)
 
     def summarize_text(self):
+        """
+        Summarizes the crawled pages best first (see rank_pages()), skipping
+        near duplicates. At most config.summary_top_k pages are summarized, and
+        no new page is started once config.summary_time_budget seconds would
+        be exceeded at the average pace so far.
+
+        :return: Dict of URL -> summary, in rank order.
+        """
         if not self.text_data:
             return "No text to summarize."
 
         summaries = {}
-        logger.info("Starting text summarization for each URL.")
+        ranked_texts = {url: self.text_data[url] for url in self.rank_pages()}
+        unique_texts, self.duplicate_pages = collapse_near_duplicates(ranked_texts)
+        selected = list(unique_texts.items())[:self.config.summary_top_k]
+        logger.info(
+            f"Starting text summarization for {len(selected)} of {len(unique_texts)} URLs "
+            f"({len(self.duplicate_pages)} near-duplicate pages skipped)."
+        )
 
         tokenizer = BartTokenizer.from_pretrained('facebook/bart-large-cnn')
-
-        for url, text in self.text_data.items():
+        budget = self.config.summary_time_budget
+        started = time.monotonic()
+
+        for done, (url, text) in enumerate(selected):
+            elapsed = time.monotonic() - started
+            if budget is not None and done and elapsed + elapsed / done > budget:
+                logger.info(
+                    f"Summarization time budget of {budget} seconds reached: "
+                    f"{len(selected) - done} lower-ranked pages not summarized."
+                )
+                break
             logger.info(f"Summarizing {url}")
             try:
                 inputs = tokenizer(text, max_length=1024, truncation=True, return_tensors='pt')
@@ -122,154 +374,3 @@ class RecursiveScraper:
                 summaries[url] = "Summary unavailable due to an error."
 
         return summaries
-
-    def generate_link_graph_static(self):
-        logger.info("Generating static link graph.")
-        plt.figure(figsize=(12, 8))
-        pos = nx.spring_layout(self.graph, k=0.5, iterations=50)
-        nx.draw(self.graph, pos, with_labels=False, node_size=50, alpha=0.7, arrows=True)
-        for key, value in pos.items():
-            plt.text(value[0], value[1], s=key, fontsize=5)
-        plt.title("Link Hierarchy Graph")
-        graph_path = os.path.join('static', 'link_graph_static.png')
-        plt.savefig(graph_path)
-        plt.close()
-        logger.info(f"Static link graph saved as {graph_path}.")
-
-    def generate_link_graph_interactive(self):
-        logger.info("Generating interactive link graph.")
-        pos = nx.spring_layout(self.graph)
-        edge_x, edge_y = [], []
-
-        for edge in self.graph.edges():
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x += [x0, x1, None]
-            edge_y += [y0, y1, None]
-
-        edge_trace = go.Scatter(x=edge_x, y=edge_y, line=dict(width=1), hoverinfo='none', mode='lines')
-        node_x, node_y, node_text = [], [], []
-
-        for node in self.graph.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            node_text.append(node)
-
-        node_trace = go.Scatter(
-            x=node_x, y=node_y, mode='markers+text', text=node_text,
-            hoverinfo='text', marker=dict(size=10)
-        )
-
-        fig = go.Figure(data=[edge_trace, node_trace],
-                        layout=go.Layout(title="Interactive Link Graph", showlegend=False, hovermode='closest'))
-
-        interactive_path = os.path.join('static', 'link_graph_interactive.html')
-        fig.write_html(interactive_path)
-        logger.info(f"Interactive link graph saved as {interactive_path}.")
-
-    def generate_link_graph_interactive_zoomable(self):
-        logger.info("Generating custom interactive hierarchical link graph with Plotly (Bottom to Top).")
-
-        levels = {}
-        max_level = 0
-
-        for node in nx.topological_sort(self.graph):
-            preds = list(self.graph.predecessors(node))
-            level = levels[preds[0]] + 1 if preds else 0
-            levels[node] = level
-            max_level = max(max_level, level)
-
-        node_positions = {}
-        nodes_in_level = {}
-        horizontal_spacing = 1
-        vertical_spacing = 2
-
-        for node, level in levels.items():
-            if level not in nodes_in_level:
-                nodes_in_level[level] = []
-            nodes_in_level[level].append(node)
-
-        for level, nodes in nodes_in_level.items():
-            y_position = -level * vertical_spacing
-            x_start = -((len(nodes) - 1) * horizontal_spacing) / 2
-
-            for i, node in enumerate(nodes):
-                x_position = x_start + i * horizontal_spacing
-                node_positions[node] = (x_position, y_position)
-
-        edge_x = []
-        edge_y = []
-        for edge in self.graph.edges():
-            x0, y0 = node_positions[edge[0]]
-            x1, y1 = node_positions[edge[1]]
-            edge_x += [x0, x1, None]
-            edge_y += [y0, y1, None]
-
-        edge_trace = go.Scatter(
-            x=edge_x, y=edge_y,
-            line=dict(width=0.5, color='#888'),
-            hoverinfo='none',
-            mode='lines'
-        )
-
-        node_x = []
-        node_y = []
-        node_text = []
-        node_depths = []
-
-        for node, (x, y) in node_positions.items():
-            node_x.append(x)
-            node_y.append(y)
-            node_text.append(node)
-            node_depths.append(levels[node])
-
-        node_trace = go.Scatter(
-            x=node_x, y=node_y,
-            mode='markers+text',
-            text=node_text,
-            textposition="bottom center",
-            hoverinfo='text',
-            marker=dict(
-                showscale=True,
-                colorscale='Viridis',
-                color=node_depths,
-                size=10,
-                colorbar=dict(
-                    title="Node Depth",
-                    titleside="right"
-                ),
-                line_width=0.5
-            )
-        )
-
-        fig = go.Figure(data=[edge_trace, node_trace],
-                        layout=go.Layout(
-                            title="Interactive Hierarchical Link Graph (Bottom to Top)",
-                            title_x=0.5,
-                            showlegend=False,
-                            hovermode='closest',
-                            margin=dict(b=20, l=5, r=5, t=40),
-                            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                            width=1200,
-                            height=800
-                        ))
-
-        interactive_path = os.path.join('static', 'link_graph_interactive_zoomable.html')
-        fig.write_html(interactive_path)
-        logger.info(f"Interactive hierarchical link graph saved as {interactive_path}.")
-
-    def generate_link_graph_json(self):
-        logger.info("Exporting link graph to JSON format.")
-        data = nx.node_link_data(self.graph)
-        json_path = os.path.join('static', 'link_graph.json')
-        with open(json_path, 'w') as json_file:
-            json.dump(data, json_file)
-        logger.info(f"Link graph JSON saved as {json_path}.")
-
-    def generate_all_graphs(self):
-        self.generate_link_graph_static()
-        self.generate_link_graph_interactive()
-        self.generate_link_graph_json()
-        self.generate_link_graph_interactive_zoomable()
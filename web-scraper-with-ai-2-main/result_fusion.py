@@ -0,0 +1,49 @@
+#result_fusion.py
+
+import logging
+from typing import Dict, List, Optional, Sequence
+from url_utils import canonicalize_url
+from config import FUSION_TOP_N
+
+logger = logging.getLogger(__name__)
+
+# Damping constant of reciprocal rank fusion; 60 is the value of the original paper
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[str]],
+    k: int = RRF_K,
+    top_n: Optional[int] = FUSION_TOP_N
+) -> List[str]:
+    """
+    Merges ranked result lists, e.g. one per (language, engine) search, with
+    reciprocal rank fusion: every list adds 1 / (k + rank) to the score of
+    each URL it contains, so URLs returned high by several searches come
+    first. URLs are compared in canonical form and counted once per list,
+    at their best rank; ties keep the order in which URLs were first seen.
+
+    Args:
+        result_lists: Result URLs of each search, best first.
+        k: Damping constant; larger values flatten the rank differences.
+        top_n: Number of URLs kept, None for all.
+
+    Returns:
+        List[str]: Unique canonical URLs, best fused score first.
+    """
+    scores: Dict[str, float] = {}
+    for results in result_lists:
+        seen = set()
+        for rank, url in enumerate(results, start=1):
+            url = canonicalize_url(url)
+            if url in seen:
+                continue
+            seen.add(url)
+            scores[url] = scores.get(url, 0.0) + 1.0 / (k + rank)
+
+    fused = sorted(scores, key=scores.get, reverse=True)
+    total = sum(len(results) for results in result_lists)
+    if top_n is not None:
+        fused = fused[:top_n]
+    logger.info(f"Fused {total} results of {len(result_lists)} searches into {len(scores)} unique URLs, keeping {len(fused)}.")
+    return fused
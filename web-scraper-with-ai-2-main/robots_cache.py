@@ -0,0 +1,161 @@
+#robots_cache.py
+
+import asyncio
+import logging
+import zlib
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+import http_client
+from exceptions import ContentTooLargeError
+
+logger = logging.getLogger(__name__)
+
+ROBOTS_USER_AGENT = '*'
+ROBOTS_MAX_BYTES = 512 * 1024
+ROBOTS_TIMEOUT = 10
+# Limit of a sitemap file, compressed when downloaded and uncompressed once gunzipped
+SITEMAP_MAX_BYTES = 10 * 1024 * 1024
+# Child sitemaps followed from a sitemap index, and URLs kept per host
+SITEMAP_MAX_FILES = 5
+SITEMAP_MAX_URLS = 5000
+
+
+def origin_of(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}"
+
+
+def gunzip(body: bytes, max_bytes: int = SITEMAP_MAX_BYTES) -> bytes:
+    """
+    Decompresses a gzip body without ever inflating more than max_bytes.
+
+    Raises:
+        ContentTooLargeError: If the uncompressed body is larger than max_bytes.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = decompressor.decompress(body, max_bytes)
+    if decompressor.unconsumed_tail or decompressor.decompress(b'', 1):
+        raise ContentTooLargeError(f"gzipped sitemap inflates past {max_bytes} bytes")
+    return data
+
+
+def parse_sitemap(body: bytes):
+    """
+    Parses a sitemap or a sitemap index, gzipped or not. Gzipped sitemaps
+    that inflate past SITEMAP_MAX_BYTES are rejected.
+
+    :return: (True if it is a sitemap index, list of <loc> URLs)
+    """
+    if body[:2] == b'\x1f\x8b':
+        body = gunzip(body)
+    root = ET.fromstring(body)
+    is_index = root.tag.endswith('sitemapindex')
+    locs = [element.text.strip() for element in root.iter() if element.tag.endswith('loc') and element.text]
+    return is_index, locs
+
+
+class HostRules:
+    """The robots.txt rules of one host, allowing everything when there are none."""
+
+    def __init__(self, parser: Optional[RobotFileParser] = None, user_agent: str = ROBOTS_USER_AGENT):
+        self.parser = parser
+        self.user_agent = user_agent
+
+    def allowed(self, url: str) -> bool:
+        return self.parser is None or self.parser.can_fetch(self.user_agent, url)
+
+    def crawl_delay(self) -> Optional[float]:
+        """Seconds between requests asked by Crawl-delay or Request-rate, None if neither is set."""
+        if self.parser is None:
+            return None
+        delays = []
+        crawl_delay = self.parser.crawl_delay(self.user_agent)
+        if crawl_delay:
+            delays.append(float(crawl_delay))
+        request_rate = self.parser.request_rate(self.user_agent)
+        if request_rate and request_rate.requests:
+            delays.append(request_rate.seconds / request_rate.requests)
+        return max(delays) if delays else None
+
+    def sitemaps(self) -> List[str]:
+        return list(self.parser.site_maps() or []) if self.parser is not None else []
+
+
+class RobotsCache:
+    """
+    Fetches robots.txt once per host (scheme and authority) and keeps the
+    parsed rules for the lifetime of the crawl. Concurrent lookups for the
+    same host share one request; the body itself also goes through the HTTP
+    cache, so later crawls do not download it again either.
+    """
+
+    def __init__(self, user_agent: str = ROBOTS_USER_AGENT):
+        self.user_agent = user_agent
+        self.rules: Dict[str, HostRules] = {}
+        self.pending: Dict[str, asyncio.Task] = {}
+
+    async def get(self, url: str) -> HostRules:
+        origin = origin_of(url)
+        rules = self.rules.get(origin)
+        if rules is not None:
+            return rules
+        task = self.pending.get(origin)
+        if task is None:
+            task = self.pending[origin] = asyncio.create_task(self.fetch_rules(origin))
+        try:
+            rules = await asyncio.shield(task)
+        finally:
+            self.pending.pop(origin, None)
+        self.rules[origin] = rules
+        return rules
+
+    async def fetch_rules(self, origin: str) -> HostRules:
+        url = f"{origin}/robots.txt"
+        try:
+            response = await http_client.get_async(url, timeout=ROBOTS_TIMEOUT, max_bytes=ROBOTS_MAX_BYTES)
+        except Exception as e:
+            # Unreachable or unreadable robots.txt: nothing is disallowed
+            logger.debug(f"No robots.txt for {origin}: {e}")
+            return HostRules(None, self.user_agent)
+
+        parser = RobotFileParser(url)
+        if response.status_code in (401, 403):
+            # Same convention as RobotFileParser.read(): access denied means everything is disallowed
+            parser.disallow_all = True
+        elif response.status_code == 200:
+            parser.parse(response.text.splitlines())
+        else:
+            return HostRules(None, self.user_agent)
+        parser.modified()
+        return HostRules(parser, self.user_agent)
+
+    async def sitemap_urls(self, url: str, limit: int = SITEMAP_MAX_URLS) -> List[str]:
+        """
+        Page URLs listed in the sitemaps of the host of url: the ones named in
+        robots.txt, or /sitemap.xml. Sitemap indexes are followed, reading
+        at most SITEMAP_MAX_FILES files.
+        """
+        origin = origin_of(url)
+        rules = await self.get(url)
+        queue = rules.sitemaps() or [f"{origin}/sitemap.xml"]
+        files = 0
+        urls = []
+        while queue and files < SITEMAP_MAX_FILES and len(urls) < limit:
+            sitemap_url = queue.pop(0)
+            files += 1
+            try:
+                response = await http_client.get_async(sitemap_url, timeout=ROBOTS_TIMEOUT, max_bytes=SITEMAP_MAX_BYTES)
+                if response.status_code != 200 or response.headers.get('x-truncated'):
+                    continue
+                is_index, locs = await asyncio.to_thread(parse_sitemap, response.content)
+            except Exception as e:
+                logger.debug(f"Skipping sitemap {sitemap_url}: {e}")
+                continue
+            if is_index:
+                queue.extend(urljoin(sitemap_url, loc) for loc in locs)
+            else:
+                # The sitemap protocol only allows URLs of the sitemap's own host
+                urls.extend(loc for loc in locs if origin_of(loc) == origin)
+        return urls[:limit]
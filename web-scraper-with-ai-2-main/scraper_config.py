@@ -1,12 +1,22 @@
 #scraper_config.py
 
 import random
+from config import (
+    MAX_PAGE_BYTES, HTML_PARSER_BACKEND, MAIN_CONTENT_EXTRACTION, MAX_CRAWL_PAGES,
+    RESPECT_ROBOTS, SITEMAP_SEEDS_PER_HOST, SUMMARY_TOP_K, SUMMARY_TIME_BUDGET, PAGERANK_WEIGHT
+)
 
 class ScraperConfig:
     def __init__(
         self, query, search_engine, num_pages, recursion_depth,
         max_links_per_page=10, timeout=100, max_retries=3,
-        min_delay=1, max_delay=5
+        min_delay=1, max_delay=5, max_concurrency=20,
+        max_requests_per_host=1, visited_bloom_capacity=None,
+        max_page_bytes=MAX_PAGE_BYTES, html_parser=HTML_PARSER_BACKEND,
+        main_content=MAIN_CONTENT_EXTRACTION, max_pages=MAX_CRAWL_PAGES,
+        respect_robots=RESPECT_ROBOTS, sitemap_seeds=SITEMAP_SEEDS_PER_HOST,
+        summary_top_k=SUMMARY_TOP_K, summary_time_budget=SUMMARY_TIME_BUDGET,
+        pagerank_weight=PAGERANK_WEIGHT
     ):
         self.query = query
         self.search_engine = search_engine.lower()
@@ -15,8 +25,29 @@ class ScraperConfig:
         self.max_links_per_page = max_links_per_page
         self.timeout = timeout
         self.max_retries = max_retries
+        # Delay range between two requests to the same host
         self.min_delay = min_delay
         self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self.max_requests_per_host = max_requests_per_host
+        # Expected number of URLs; when set, visited URLs go into a Bloom filter
+        self.visited_bloom_capacity = visited_bloom_capacity
+        # Byte budget per page; larger bodies are cut or skipped
+        self.max_page_bytes = max_page_bytes
+        self.html_parser = html_parser
+        # Strip navigation, headers and footers from the extracted text
+        self.main_content = main_content
+        # Global budget of pages fetched per crawl, spent on the most relevant links first; None for no limit
+        self.max_pages = max_pages
+        # Skip URLs disallowed by robots.txt and honor its Crawl-delay
+        self.respect_robots = respect_robots
+        # Sitemap URLs enqueued per host, the most relevant to the query first; 0 disables sitemap seeding
+        self.sitemap_seeds = sitemap_seeds
+        # Pages summarized, best ranked first: at most summary_top_k, within summary_time_budget seconds; None for no limit
+        self.summary_top_k = summary_top_k
+        self.summary_time_budget = summary_time_budget
+        # Share of PageRank in the page ranking, the rest being query relevance
+        self.pagerank_weight = pagerank_weight
 
     def get_random_user_agent(self):
         user_agents = [
@@ -2,15 +2,13 @@
 
 import logging
 from typing import List
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from bs4 import BeautifulSoup
-from config import SEARCH_ENGINES
-from webdriver_manager.chrome import ChromeDriverManager
+from config import SEARCH_ENGINES, SERP_HTTP_ENABLED
+from driver_pool import get_driver_pool
+import serp_http
+from serp_cache import get_serp_cache
+from serp_selectors import extract_results, selectors_for
+from browser_profile import wait_for_any
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -33,54 +31,62 @@ def get_search_results(query: str, search_engine: str, num_pages: int) -> List[s
         logging.error(f"Unsupported search engine: {search_engine}")
         return []
 
-    # Set up the Chrome WebDriver
-    try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service)
-        logging.info("Chrome WebDriver started successfully.")
-    except WebDriverException as e:
-        logging.critical(f"Failed to start Chrome WebDriver: {e}")
-        return []
+    # Searches made recently are answered from the SERP cache
+    serp_cache = get_serp_cache()
+    cached = serp_cache.get_pages(search_engine, query, num_pages)
+    if cached is not None:
+        return cached
+
+    if SERP_HTTP_ENABLED:
+        links = serp_http.search(query, search_engine, num_pages)
+        if links is not None:
+            return links
 
-    results = set()  # Use a set to avoid duplicate URLs
+    results = {}  # Ordered and without duplicates: keys are the URLs in rank order
 
+    # Borrow a Chrome WebDriver from the shared pool
     try:
-        for page in range(num_pages):
-            # Construct the URL for each page of results
-            url = f"{base_url}{query}&start={page * 10}"
-            retry_attempts = 3  # Set the retry limit
-            while retry_attempts > 0:
-                try:
-                    driver.get(url)
-                    logging.info(f"Accessing {url}")
+        with get_driver_pool().driver() as driver:
+            for page in range(num_pages):
+                # Construct the URL for each page of results
+                url = f"{base_url}{query}&start={page * 10}"
+                retry_attempts = 3  # Set the retry limit
+                loaded = False
+                while retry_attempts > 0:
+                    try:
+                        # With the eager load strategy get() returns once the DOM is ready
+                        driver.get(url)
+                        logging.info(f"Accessing {url}")
+                        logging.info(f"Page {page + 1} loaded successfully.")
+                        loaded = True
+                        break
+                    except TimeoutException:
+                        retry_attempts -= 1
+                        logging.warning(f"Page {page + 1} took too long to load. Retrying... ({retry_attempts} attempts left)")
+                if not loaded:
+                    # page_source would still hold the previous page
+                    logging.error(f"Page {page + 1} failed to load after multiple attempts. Skipping.")
+                    continue
 
-                    # Wait for the page to load
-                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    logging.info(f"Page {page + 1} loaded successfully.")
-                    break
+                # Wait for the results themselves, which some engines render with JavaScript
+                try:
+                    wait_for_any(driver, selectors_for(search_engine).links, 10)
+                    results_appeared = True
                 except TimeoutException:
-                    retry_attempts -= 1
-                    logging.warning(f"Page {page + 1} took too long to load. Retrying... ({3 - retry_attempts} attempts left)")
-                    if retry_attempts == 0:
-                        logging.error(f"Page {page + 1} failed to load after multiple attempts. Skipping.")
-                        continue
-
-            # Parse the page content
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            links = soup.find_all('a')
+                    logging.warning(f"No results appeared on page {page + 1}.")
+                    results_appeared = False
 
-            # Extract and filter valid result URLs
-            for link in links:
-                href = link.get('href')
-                if href and isinstance(href, str) and href.startswith('http') and not href.startswith(base_url):
-                    results.add(href)
-                    logging.info(f"Found link: {href}")
+                # Parse the page content once and keep the organic result URLs
+                page_links = extract_results(search_engine, driver.page_source)
+                results.update(dict.fromkeys(page_links))
+                logging.info(f"Found {len(page_links)} links on page {page + 1}.")
+                # A page whose results never showed up may be a block or a half-rendered
+                # page: use what it has, but search again next time
+                if results_appeared:
+                    serp_cache.put(search_engine, query, page, page_links)
 
-    except WebDriverException as e:
+    except (WebDriverException, TimeoutError) as e:
         logging.error(f"WebDriver encountered an error: {e}")
-    finally:
-        driver.quit()
-        logging.info("Chrome WebDriver closed.")
 
     logging.info(f"Total unique links collected: {len(results)}")
     return list(results)
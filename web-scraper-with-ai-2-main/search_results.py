@@ -1,21 +1,18 @@
 #search_results.py
 
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
+import math
+from selenium.common.exceptions import TimeoutException
+from driver_pool import get_driver_pool
+from config import SERP_HTTP_ENABLED
+import serp_http
+from serp_selectors import extract_results, selectors_for
+from browser_profile import wait_for_any
+from serp_cache import RESULTS_PER_PAGE, get_serp_cache
 
 logger = logging.getLogger(__name__)
 
 def get_search_results(query, search_engine, num_results):
-    options = Options()
-    options.headless = True
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-
-    driver = webdriver.Chrome(options=options)
-
     search_urls = {
         'google': 'https://www.google.com/search?q={query}&num={num}',
         'bing': 'https://www.bing.com/search?q={query}&count={num}',
@@ -28,68 +25,35 @@ def get_search_results(query, search_engine, num_results):
 
     if search_engine not in search_urls:
         logger.error(f"Search engine {search_engine} not supported.")
-        driver.quit()
         return []
 
+    num_pages = math.ceil(num_results / RESULTS_PER_PAGE)
+    serp_cache = get_serp_cache()
+    cached = serp_cache.get_pages(search_engine, query, num_pages)
+    if cached is not None:
+        return cached[:num_results]
+
+    if SERP_HTTP_ENABLED and serp_http.engine_name(search_engine):
+        links = serp_http.search(query, search_engine, num_pages)
+        if links is not None:
+            return links[:num_results]
+
     url = search_urls[search_engine].format(query=query, num=num_results)
-    driver.get(url)
 
-    links = []
+    results = []
     try:
-        if search_engine == 'google':
-            results = driver.find_elements(By.CSS_SELECTOR, 'div.g')
-            for result in results[:num_results]:
-                link_element = result.find_element(By.TAG_NAME, 'a')
-                if link_element:
-                    link = link_element.get_attribute('href')
-                    if link:
-                        links.append(link)
-        elif search_engine == 'bing':
-            results = driver.find_elements(By.CSS_SELECTOR, 'li.b_algo')
-            for result in results[:num_results]:
-                link_element = result.find_element(By.TAG_NAME, 'a')
-                if link_element:
-                    link = link_element.get_attribute('href')
-                    if link:
-                        links.append(link)
-        elif search_engine == 'baidu':
-            results = driver.find_elements(By.CSS_SELECTOR, 'h3.t > a')
-            for result in results[:num_results]:
-                link = result.get_attribute('href')
-                if link:
-                    links.append(link)
-        elif search_engine == 'duckduckgo':
-            results = driver.find_elements(By.CSS_SELECTOR, 'a.result__a')
-            for result in results[:num_results]:
-                link = result.get_attribute('href')
-                if link:
-                    links.append(link)
-        elif search_engine == 'yahoo':
-            results = driver.find_elements(By.CSS_SELECTOR, 'div.dd.algo')
-            for result in results[:num_results]:
-                link_element = result.find_element(By.TAG_NAME, 'a')
-                if link_element:
-                    link = link_element.get_attribute('href')
-                    if link:
-                        links.append(link)
-        elif search_engine == 'yandex':
-            results = driver.find_elements(By.CSS_SELECTOR, 'a.Link.Link_theme_normal.organic__url.link_cropped_no.i-bem')
-            for result in results[:num_results]:
-                link = result.get_attribute('href')
-                if link:
-                    links.append(link)
-        elif search_engine == 'ask':
-            results = driver.find_elements(By.CSS_SELECTOR, 'div.PartialSearchResults-item')
-            for result in results[:num_results]:
-                link_element = result.find_element(By.CSS_SELECTOR, 'a.PartialSearchResults-item-title-link.result-link')
-                if link_element:
-                    link = link_element.get_attribute('href')
-                    if link:
-                        links.append(link)
-        else:
-            logger.error(f"Search engine {search_engine} not supported.")
+        with get_driver_pool().driver() as driver:
+            driver.get(url)
+            try:
+                wait_for_any(driver, selectors_for(search_engine).links, 10)
+            except TimeoutException:
+                logger.warning(f"No results appeared on {search_engine}.")
+            # page_source is read once and parsed locally instead of a WebDriver call per result
+            results = extract_results(search_engine, driver.page_source)
     except Exception as e:
         logger.error(f"Error extracting search results: {e}")
 
-    driver.quit()
+    links = results[:num_results]
+    # Fewer results than asked for means the engine had no more, so a short last page is complete
+    serp_cache.put_results(search_engine, query, links, complete=len(results) < num_results)
     return links
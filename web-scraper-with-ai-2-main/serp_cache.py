@@ -0,0 +1,112 @@
+#serp_cache.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import List, Optional
+from config import SERP_CACHE_PATH, SERP_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+# Page index unit shared by every search path, whatever page size the engine URL asks for
+RESULTS_PER_PAGE = 10
+
+
+def normalize_query(query):
+    """Form of a query used in cache keys: Unicode-normalized, case-folded, single-spaced."""
+    return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+
+def cache_key(search_engine, query, page):
+    return search_engine.lower(), normalize_query(query), page
+
+
+class SerpCache:
+    """
+    On-disk cache of search results, one row per (engine, normalized query,
+    page index) holding the result URLs of that page in rank order. Rows
+    older than the TTL are ignored and dropped when the cache is opened.
+    Empty pages are never stored, so a blocked or failed search is retried
+    next time.
+    """
+
+    def __init__(self, path=SERP_CACHE_PATH, ttl=SERP_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS results (
+                engine TEXT,
+                query TEXT,
+                page INTEGER,
+                links TEXT,
+                stored_at REAL,
+                PRIMARY KEY (engine, query, page)
+            )"""
+        )
+        expired = self.conn.execute("DELETE FROM results WHERE stored_at < ?", (time.time() - ttl,)).rowcount
+        self.conn.commit()
+        if expired:
+            logger.info(f"SERP cache dropped {expired} expired pages.")
+
+    def get(self, search_engine, query, page) -> Optional[List[str]]:
+        """The cached result URLs of one page, None if missing or expired."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT links, stored_at FROM results WHERE engine = ? AND query = ? AND page = ?",
+                cache_key(search_engine, query, page)
+            ).fetchone()
+        if row is None or time.time() - row[1] >= self.ttl:
+            return None
+        return json.loads(row[0])
+
+    def get_pages(self, search_engine, query, num_pages) -> Optional[List[str]]:
+        """The result URLs of pages 0 to num_pages - 1, None unless all of them are cached."""
+        links = []
+        for page in range(num_pages):
+            page_links = self.get(search_engine, query, page)
+            if page_links is None:
+                return None
+            links.extend(page_links)
+        logger.info(f"SERP cache hit for {search_engine} '{query}' ({num_pages} pages).")
+        return list(dict.fromkeys(links))
+
+    def put(self, search_engine, query, page, links):
+        if not links:
+            return
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (*cache_key(search_engine, query, page), json.dumps(list(links)), time.time())
+            )
+            self.conn.commit()
+
+    def put_results(self, search_engine, query, links, complete=False):
+        """
+        Stores results fetched in one go (e.g. with &num=) as consecutive pages
+        of RESULTS_PER_PAGE. A shorter last page is stored only if complete,
+        i.e. the engine had no more results: a list cut at the number of
+        results asked for would otherwise be served as a whole page later.
+        """
+        end = len(links) if complete else len(links) - len(links) % RESULTS_PER_PAGE
+        for page, start in enumerate(range(0, end, RESULTS_PER_PAGE)):
+            self.put(search_engine, query, page, links[start:start + RESULTS_PER_PAGE])
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_serp_cache():
+    """Returns the process-wide SerpCache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SerpCache()
+        return _cache
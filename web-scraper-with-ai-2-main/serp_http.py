@@ -0,0 +1,99 @@
+#serp_http.py
+
+import logging
+from typing import List, Optional
+from urllib.parse import quote_plus
+import http_client
+from serp_cache import RESULTS_PER_PAGE, get_serp_cache
+from serp_selectors import extract_results
+
+logger = logging.getLogger(__name__)
+
+# Search engines answer bare HTTP clients with a block page, so SERPs are requested as a desktop browser
+SERP_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36'
+)
+SERP_TIMEOUT = 10
+
+# Static results pages, by page index (0-based)
+SERP_URLS = {
+    'Google': lambda query, page: f"https://www.google.com/search?q={quote_plus(query)}&start={page * RESULTS_PER_PAGE}&hl=en",
+    'Bing': lambda query, page: f"https://www.bing.com/search?q={quote_plus(query)}&first={page * RESULTS_PER_PAGE + 1}",
+    'DuckDuckGo': lambda query, page: f"https://html.duckduckgo.com/html/?q={quote_plus(query)}&s={page * RESULTS_PER_PAGE}",
+    'Yahoo': lambda query, page: f"https://search.yahoo.com/search?p={quote_plus(query)}&b={page * RESULTS_PER_PAGE + 1}",
+}
+ENGINE_NAMES = {name.lower(): name for name in SERP_URLS}
+
+
+def engine_name(search_engine: str) -> Optional[str]:
+    """Canonical engine name ('Google', 'Bing', ...) for any capitalization, None if there is no HTTP parser for it."""
+    return ENGINE_NAMES.get(search_engine.lower())
+
+
+def parse_serp(search_engine: str, html: str) -> List[str]:
+    """
+    Organic result URLs of a static results page, in page order, without
+    ads, duplicates or links back to the engine (see serp_selectors).
+    """
+    return extract_results(search_engine, html)
+
+
+def fetch_serp_page(search_engine: str, query: str, page: int) -> Optional[List[str]]:
+    """
+    Fetches and parses one results page over HTTP.
+
+    :return: The result URLs, or None if the page is unusable (blocked, a
+        consent or JavaScript wall, or an error) and a browser is needed.
+    """
+    engine = engine_name(search_engine)
+    url = SERP_URLS[engine](query, page)
+    try:
+        response = http_client.get(
+            url, headers={'User-Agent': SERP_USER_AGENT}, timeout=SERP_TIMEOUT,
+            use_cache=False, content_types=http_client.HTML_TYPES
+        )
+    except Exception as e:
+        logger.info(f"HTTP results page of {engine} unavailable: {e}")
+        return None
+    if response.status_code != 200:
+        logger.info(f"HTTP results page of {engine} answered {response.status_code}.")
+        return None
+    return parse_serp(engine, response.text)
+
+
+def search(query: str, search_engine: str, num_pages: int) -> Optional[List[str]]:
+    """
+    Searches without a browser, reading the engine's static results pages.
+    Pages found in the SERP cache are not fetched again.
+
+    Args:
+        query (str): The search query.
+        search_engine (str): One of the engines of config.SEARCH_ENGINES, any capitalization.
+        num_pages (int): Number of result pages to read.
+
+    Returns:
+        Optional[List[str]]: The unique result URLs in rank order, or None
+        when the engine has no HTTP parser or its first page is unusable,
+        in which case the caller should fall back to Selenium.
+    """
+    engine = engine_name(search_engine)
+    if engine is None:
+        return None
+    cache = get_serp_cache()
+    results = []
+    for page in range(num_pages):
+        links = cache.get(engine, query, page)
+        if links is None:
+            links = fetch_serp_page(engine, query, page)
+            cache.put(engine, query, page, links)
+        if not links:
+            if page == 0:
+                # A first page without results is a wall, not the end of the results
+                logger.info(f"No usable HTTP results from {engine}, falling back to the browser.")
+                return None
+            break
+        results.extend(links)
+    results = list(dict.fromkeys(results))
+    logger.info(f"{len(results)} results from {engine} over HTTP.")
+    return results
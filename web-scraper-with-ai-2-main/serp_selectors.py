@@ -0,0 +1,110 @@
+#serp_selectors.py
+
+import base64
+import re
+from typing import Callable, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import parse_qs, unquote, urljoin, urlparse
+from html_extraction import select_hrefs
+
+YAHOO_REDIRECT_RE = re.compile(r'/RU=([^/]+)/')
+
+
+def unwrap_google(url: str) -> str:
+    # The basic HTML page links results through /url?q=<target>
+    parsed = urlparse(url)
+    if parsed.path == '/url':
+        return parse_qs(parsed.query).get('q', [''])[0]
+    return url
+
+
+def unwrap_bing(url: str) -> str:
+    # Tracked results go through /ck/a?...&u=a1<base64 of the target>
+    parsed = urlparse(url)
+    if parsed.path == '/ck/a':
+        encoded = parse_qs(parsed.query).get('u', [''])[0]
+        if not encoded.startswith('a1'):
+            return ''
+        encoded = encoded[2:]
+        try:
+            return base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode('utf-8')
+        except (ValueError, UnicodeDecodeError):
+            return ''
+    return url
+
+
+def unwrap_duckduckgo(url: str) -> str:
+    # //duckduckgo.com/l/?uddg=<target>&rut=...
+    parsed = urlparse(url)
+    if parsed.path == '/l/':
+        return parse_qs(parsed.query).get('uddg', [''])[0]
+    return url
+
+
+def unwrap_yahoo(url: str) -> str:
+    # https://r.search.yahoo.com/.../RU=<target>/RK=.../RS=...
+    match = YAHOO_REDIRECT_RE.search(url)
+    return unquote(match.group(1)) if match else url
+
+
+class SerpSelectors(NamedTuple):
+    # CSS selectors of the result links, tried in order until one matches
+    links: Tuple[str, ...]
+    # Page the hrefs are relative to
+    base_url: str
+    # Links to these domains (and their subdomains) are navigation or ads, not results
+    hosts: Tuple[str, ...]
+    # Decodes the engine's redirect links to the target URL
+    unwrap: Optional[Callable[[str], str]] = None
+
+
+SERP_SELECTORS = {
+    'google': SerpSelectors(
+        ('div.yuRUbf a[href]', 'a[href^="/url?"]'), 'https://www.google.com/',
+        ('google.com', 'googleadservices.com', 'googlesyndication.com'), unwrap_google
+    ),
+    'bing': SerpSelectors(('li.b_algo h2 a[href]',), 'https://www.bing.com/', ('bing.com',), unwrap_bing),
+    # Baidu results go through baidu.com/link redirects that only resolve server-side
+    'baidu': SerpSelectors(('h3.t > a[href]',), 'https://www.baidu.com/', ()),
+    # a.result__a on the HTML endpoint; ads link to duckduckgo.com/y.js and are dropped with the engine's own links
+    'duckduckgo': SerpSelectors(
+        ('a.result__a[href]', 'a[data-testid="result-title-a"][href]'), 'https://duckduckgo.com/', ('duckduckgo.com',), unwrap_duckduckgo
+    ),
+    'yahoo': SerpSelectors(('div.algo h3 a[href]',), 'https://search.yahoo.com/', ('yahoo.com',), unwrap_yahoo),
+    'yandex': SerpSelectors(('a.organic__url[href]',), 'https://yandex.com/', ('yandex.com', 'yandex.ru')),
+    'ask': SerpSelectors(
+        ('div.PartialSearchResults-item a.PartialSearchResults-item-title-link.result-link[href]',), 'https://www.ask.com/', ('ask.com',)
+    ),
+}
+
+
+def is_engine_host(netloc: str, hosts: Tuple[str, ...]) -> bool:
+    host = netloc.lower().split(':')[0]
+    return any(host == domain or host.endswith('.' + domain) for domain in hosts)
+
+
+def selectors_for(search_engine: str) -> Optional[SerpSelectors]:
+    return SERP_SELECTORS.get(search_engine.lower())
+
+
+def extract_results(search_engine: str, html: Union[str, bytes]) -> List[str]:
+    """
+    Organic result URLs of a results page, in page order and without
+    duplicates, from a single parse of its HTML (e.g. a WebDriver
+    page_source).
+
+    Raises:
+        KeyError: If the engine has no entry in SERP_SELECTORS.
+    """
+    selectors = SERP_SELECTORS[search_engine.lower()]
+    results = []
+    for href in select_hrefs(html, selectors.links):
+        url = urljoin(selectors.base_url, href)
+        if selectors.unwrap:
+            url = selectors.unwrap(url)
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            continue
+        if is_engine_host(parsed.netloc, selectors.hosts):
+            continue
+        results.append(url)
+    return list(dict.fromkeys(results))
@@ -0,0 +1,69 @@
+#test_crawl_checkpoint.py
+
+import pytest
+from crawl_checkpoint import CrawlCheckpoint
+from exceptions import CheckpointMismatchError
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'checkpoints.sqlite')
+
+
+def saved_job(path, job_id='job'):
+    """A job with one page fetched and one still in its frontier."""
+    with CrawlCheckpoint(job_id, path=path) as checkpoint:
+        checkpoint.start('python asyncio', 'Google', 2)
+        checkpoint.add_node('http://site.test/a', 1)
+        checkpoint.add_node('http://site.test/b', 2, parent='http://site.test/a')
+        checkpoint.add_link('http://site.test/a', 'http://site.test/b')
+        checkpoint.add_link('http://site.test/a', 'http://site.test/b')
+        checkpoint.add_page('http://site.test/a', 'text of a')
+
+
+def test_job_is_resumed_by_id(path):
+    saved_job(path)
+    saved_job(path, job_id='other')
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        assert checkpoint.has_state()
+        assert checkpoint.status() == 'running'
+        nodes, pages = checkpoint.load()
+        assert [url for url, _, _, _ in nodes] == ['http://site.test/a', 'http://site.test/b']
+        assert pages == {'http://site.test/a': 'text of a'}
+        assert checkpoint.load_links() == [('http://site.test/a', 'http://site.test/b')]
+        checkpoint.start('python asyncio', 'Google', 2)
+
+
+def test_finished_job_can_be_started_again(path):
+    saved_job(path)
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        checkpoint.finish()
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        assert checkpoint.status() == 'done'
+        checkpoint.start('python asyncio', 'Google', 2)
+        assert checkpoint.status() == 'running'
+
+
+@pytest.mark.parametrize('params', [
+    ('python threads', 'Google', 2),
+    ('python asyncio', 'Bing', 2),
+    ('python asyncio', 'Google', 3),
+])
+def test_job_is_not_resumed_with_other_parameters(path, params):
+    saved_job(path)
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        with pytest.raises(CheckpointMismatchError):
+            checkpoint.start(*params)
+        assert checkpoint.status() == 'running'
+
+
+def test_job_without_state_takes_new_parameters(path):
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        checkpoint.start('python asyncio', 'Google', 2)
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        checkpoint.start('python threads', 'Bing', 3)
+        checkpoint.add_node('http://site.test/a', 1)
+        checkpoint.flush()
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        with pytest.raises(CheckpointMismatchError):
+            checkpoint.start('python asyncio', 'Google', 2)
@@ -0,0 +1,96 @@
+#test_host_health.py
+
+import pytest
+import host_health
+from exceptions import CircuitOpenError
+from host_health import HostHealth
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(host_health, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def tripped(clock):
+    """A HostHealth whose circuit for example.com has just opened."""
+    health = HostHealth(initial_timeout=15, failure_threshold=3, cooldown=60)
+    for _ in range(3):
+        health.record_failure('example.com')
+    return health
+
+
+def test_circuit_opens_after_threshold(tripped):
+    with pytest.raises(CircuitOpenError):
+        tripped.check('example.com')
+    tripped.check('other.com')
+
+
+def test_single_probe_after_cooldown(clock, tripped):
+    clock.now += 61
+    tripped.check('example.com')
+    for _ in range(5):
+        with pytest.raises(CircuitOpenError):
+            tripped.check('example.com')
+    assert tripped.is_open('example.com')
+
+
+def test_probe_success_closes_circuit(clock, tripped):
+    clock.now += 61
+    tripped.check('example.com')
+    tripped.record_success('example.com', 0.2)
+    for _ in range(3):
+        tripped.check('example.com')
+    assert not tripped.is_open('example.com')
+
+
+def test_open_circuit_closes_when_probe_succeeds(clock, tripped):
+    assert tripped.is_open('example.com')
+    clock.now += 61
+    tripped.check('example.com')
+    tripped.record_success('example.com', 0.2)
+    assert tripped.hosts['example.com'].open_until == 0
+    assert tripped.retry_after('example.com') == 0
+    # Closed, not merely past its cool-down: a new run of failures starts from zero
+    for _ in range(2):
+        tripped.record_failure('example.com')
+    tripped.check('example.com')
+    assert not tripped.is_open('example.com')
+
+
+def test_success_during_cooldown_closes_circuit(clock, tripped):
+    # A request sent before the circuit opened answers during the cool-down
+    clock.now += 10
+    tripped.record_success('example.com', 0.2)
+    assert not tripped.is_open('example.com')
+    tripped.check('example.com')
+
+
+def test_probe_failure_reopens_with_longer_cooldown(clock, tripped):
+    clock.now += 61
+    tripped.check('example.com')
+    tripped.record_failure('example.com')
+    clock.now += 61
+    with pytest.raises(CircuitOpenError):
+        tripped.check('example.com')
+    clock.now += 60
+    tripped.check('example.com')
+
+
+def test_lost_probe_is_replaced(clock, tripped):
+    clock.now += 61
+    tripped.check('example.com')
+    clock.now += 16
+    tripped.check('example.com')
+    with pytest.raises(CircuitOpenError):
+        tripped.check('example.com')
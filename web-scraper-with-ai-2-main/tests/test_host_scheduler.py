@@ -0,0 +1,58 @@
+#test_host_scheduler.py
+
+import asyncio
+import time
+from host_scheduler import HostScheduler
+
+CRAWL_DELAY = 0.1
+
+
+async def crawl_one_host(scheduler, urls_by_score):
+    """Fetches the first URL, parks the rest and records when each parked one is handed out."""
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    fetched = []
+
+    def on_ready(entry):
+        url = entry[-1]
+        assert scheduler.reserve(url) == 0
+        fetched.append((time.monotonic(), url))
+        # The fetch itself is instant: release the slot on the next loop iteration
+        loop.call_soon(scheduler.release, url)
+        if len(fetched) == len(urls_by_score):
+            done.set_result(None)
+
+    scheduler.on_ready = on_ready
+    first = 'http://site.test/start'
+    assert scheduler.reserve(first) == 0
+    start = time.monotonic()
+    for sequence, (score, url) in enumerate(urls_by_score):
+        assert scheduler.reserve(url) > 0
+        scheduler.park(url, (-score, sequence, url))
+    scheduler.release(first)
+    await asyncio.wait_for(done, 5)
+    scheduler.cancel_wakeups()
+    return start, fetched
+
+
+def test_same_host_requests_are_spaced_and_best_first():
+    scheduler = HostScheduler(min_delay=0, max_delay=0)
+    scheduler.set_crawl_delay('site.test', CRAWL_DELAY)
+    urls_by_score = [(0.1, 'http://site.test/low'), (0.9, 'http://site.test/high')]
+
+    start, fetched = asyncio.run(crawl_one_host(scheduler, urls_by_score))
+
+    assert [url for _, url in fetched] == ['http://site.test/high', 'http://site.test/low']
+    times = [start] + [at for at, _ in fetched]
+    for previous, current in zip(times, times[1:]):
+        # Small tolerance for timer resolution
+        assert current - previous >= CRAWL_DELAY - 0.01
+    assert scheduler.parked_count() == 0
+
+
+def test_other_hosts_are_not_held_back():
+    scheduler = HostScheduler(min_delay=0, max_delay=0)
+    scheduler.set_crawl_delay('site.test', CRAWL_DELAY)
+    assert scheduler.reserve('http://site.test/a') == 0
+    assert scheduler.reserve('http://site.test/b') > 0
+    assert scheduler.reserve('http://other.test/a') == 0
@@ -0,0 +1,83 @@
+#test_html_extraction.py
+
+import pytest
+import html_extraction
+from html_extraction import available_backends, extract_text, select_hrefs, to_text
+
+# Common theme markup: the body wrapper's class names a sidebar and the page has no nav/footer tags
+SIDEBAR_WRAPPER_PAGE = """
+<html><body>
+<div class="site has-sidebar">
+  <div class="menu"><a href="/">Home</a> <a href="/blog">Blog</a></div>
+  <main>
+    <h1>Article title</h1>
+    <p>The main text of the article.</p>
+    <div class="share-buttons">Share on social networks</div>
+  </main>
+  <div class="sidebar">Latest posts</div>
+</div>
+</body></html>
+"""
+
+ARTICLE_IN_NAV_PAGE = """
+<html><body>
+<nav>Menu</nav>
+<div role="navigation"><article><p>Text wrapped by a mislabelled container.</p></article></div>
+</body></html>
+"""
+
+NO_MAIN_PAGE = """
+<html><body>
+<header>Site header</header>
+<div id="content"><p>Body text.</p></div>
+<div id="footer">Copyright</div>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_main_content_survives_boilerplate_wrapper(backend):
+    text = extract_text(SIDEBAR_WRAPPER_PAGE, main_content=True, backend=backend)
+    assert text == 'Article title The main text of the article.'
+
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_main_candidate_inside_boilerplate_element_is_kept(backend):
+    text = extract_text(ARTICLE_IN_NAV_PAGE, main_content=True, backend=backend)
+    assert text == 'Text wrapped by a mislabelled container.'
+
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_boilerplate_is_stripped_without_main_candidate(backend):
+    assert extract_text(NO_MAIN_PAGE, main_content=True, backend=backend) == 'Body text.'
+
+
+@pytest.mark.parametrize('backend', available_backends())
+def test_full_text_without_main_content(backend):
+    text = extract_text(SIDEBAR_WRAPPER_PAGE, main_content=False, backend=backend)
+    assert 'Latest posts' in text and 'The main text of the article.' in text
+
+
+@pytest.mark.parametrize('backend', [name for name in available_backends() if name != 'selectolax'])
+def test_select_hrefs_parses_with_the_requested_backend(monkeypatch, backend):
+    features = []
+    beautiful_soup = html_extraction.BeautifulSoup
+
+    def soup(markup, parser):
+        features.append(parser)
+        return beautiful_soup(markup, parser)
+
+    monkeypatch.setattr(html_extraction, 'BeautifulSoup', soup)
+    assert select_hrefs(SIDEBAR_WRAPPER_PAGE, ['main a[href]', 'div.menu a[href]'], backend) == ['/', '/blog']
+    assert features == [backend]
+
+
+def test_header_charset_wins_over_meta_charset():
+    html = '<meta charset="utf-8"><p>caffè</p>'.encode('iso-8859-1')
+    assert to_text(html, 'iso-8859-1') == '<meta charset="utf-8"><p>caffè</p>'
+
+
+def test_meta_charset_without_header_charset():
+    html = '<meta charset="windows-1252"><p>caffè</p>'.encode('windows-1252')
+    assert to_text(html) == '<meta charset="windows-1252"><p>caffè</p>'
+    assert to_text(html, 'no-such-codec') == '<meta charset="windows-1252"><p>caffè</p>'
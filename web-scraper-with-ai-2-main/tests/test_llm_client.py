@@ -0,0 +1,152 @@
+#test_llm_client.py
+
+import json
+import httpx
+import pytest
+import llm_client
+from config import LLM_BACKOFF, LLM_BACKOFF_MAX, OLLAMA_PROBE_INTERVAL
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping only moves the clock forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_client, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def mock_provider(monkeypatch):
+    """Routes a provider's pooled client to a handler; returns the list of requests sent."""
+    monkeypatch.setattr(llm_client, '_ollama_probe', None)
+
+    def install(provider, handler):
+        requests = []
+
+        def record(request):
+            requests.append(request)
+            return handler(request)
+
+        monkeypatch.setitem(llm_client._clients, provider, httpx.Client(transport=httpx.MockTransport(record)))
+        return requests
+    return install
+
+
+def gpt_answer(text):
+    return httpx.Response(200, json={'choices': [{'message': {'content': text}}]})
+
+
+def test_backoff_delay_uses_retry_after():
+    assert llm_client.backoff_delay(0, httpx.Response(429, headers={'retry-after': '2'})) == 2
+
+
+def test_backoff_delay_caps_retry_after():
+    response = httpx.Response(503, headers={'retry-after': str(LLM_BACKOFF_MAX * 10)})
+    assert llm_client.backoff_delay(0, response) == LLM_BACKOFF_MAX
+
+
+@pytest.mark.parametrize('attempt', [0, 1, 3, 10])
+def test_backoff_delay_without_retry_after_is_jittered_exponential(attempt):
+    base = min(LLM_BACKOFF * 2 ** attempt, LLM_BACKOFF_MAX)
+    response = httpx.Response(503, headers={'retry-after': 'Wed, 21 Oct 2015 07:28:00 GMT'})
+    for _ in range(20):
+        assert base * 0.5 <= llm_client.backoff_delay(attempt, response) <= base
+        assert base * 0.5 <= llm_client.backoff_delay(attempt) <= base
+
+
+def test_retryable_answer_is_retried_after_retry_after(clock, mock_provider):
+    answers = iter([httpx.Response(429, headers={'retry-after': '3'}), gpt_answer('ok')])
+    requests = mock_provider('gpt', lambda request: next(answers))
+    assert llm_client.generate('gpt', 'prompt', retries=3) == 'ok'
+    assert len(requests) == 2
+    assert clock.sleeps == [3]
+
+
+@pytest.mark.parametrize('status', [400, 401, 403, 404, 422])
+def test_non_retryable_answer_is_not_retried(clock, mock_provider, status):
+    requests = mock_provider('gpt', lambda request: httpx.Response(status, text='bad request'))
+    assert llm_client.generate('gpt', 'prompt', retries=3) is None
+    assert len(requests) == 1
+    assert clock.sleeps == []
+
+
+def test_transport_errors_are_retried_until_attempts_run_out(clock, mock_provider):
+    def refuse(request):
+        raise httpx.ConnectError('connection refused', request=request)
+
+    requests = mock_provider('gpt', refuse)
+    assert llm_client.generate('gpt', 'prompt', retries=3) is None
+    assert len(requests) == 3
+    assert len(clock.sleeps) == 2
+
+
+def test_deadline_stops_retries(clock, mock_provider):
+    requests = mock_provider('gpt', lambda request: httpx.Response(503, headers={'retry-after': '10'}))
+    assert llm_client.generate('gpt', 'prompt', retries=5, deadline=15) is None
+    # The second backoff would end past the deadline
+    assert len(requests) == 2
+    assert clock.sleeps == [10]
+
+
+def test_expired_ends_at_sends_nothing(clock, mock_provider):
+    requests = mock_provider('gpt', lambda request: gpt_answer('late'))
+    clock.now = 100
+    assert llm_client.generate('gpt', 'prompt', ends_at=50) is None
+    assert requests == []
+
+
+def test_attempt_timeout_is_capped_by_deadline(clock, mock_provider):
+    requests = mock_provider('gpt', lambda request: gpt_answer('ok'))
+    assert llm_client.generate('gpt', 'prompt', timeout=60, deadline=5) == 'ok'
+    assert requests[0].extensions['timeout']['read'] == 5
+
+
+def test_unreachable_ollama_is_probed_once_and_skipped(clock, mock_provider):
+    def refuse(request):
+        raise httpx.ConnectError('connection refused', request=request)
+
+    requests = mock_provider('ollama', refuse)
+
+    assert llm_client.generate('ollama', 'prompt') is None
+    assert llm_client.generate_response('prompt', True, False, False, False) == "Ollama: None"
+    # One probe, no generate attempts and no backoff
+    assert [request.method for request in requests] == ['GET']
+    assert clock.sleeps == []
+
+    clock.now += OLLAMA_PROBE_INTERVAL
+    assert llm_client.generate('ollama', 'prompt') is None
+    assert [request.method for request in requests] == ['GET', 'GET']
+
+
+def test_temperature_reaches_only_gpt_and_cohere(mock_provider):
+    answers = {
+        'ollama': httpx.Response(200, json={'response': 'o'}),
+        'cohere': httpx.Response(200, json={'text': 'c'}),
+        'gpt': gpt_answer('g'),
+        'gemini': httpx.Response(200, json={'candidates': [{'content': {'parts': [{'text': 'm'}]}}]}),
+    }
+    requests = {provider: mock_provider(provider, lambda request, answer=answer: answer) for provider, answer in answers.items()}
+
+    response = llm_client.generate_response('prompt', True, True, True, True, temperature=0.2)
+
+    assert response == "Ollama: o\nCohere: c\nGPT: g\nGemini: m"
+    # Ollama's generate call follows its reachability probe
+    payloads = {provider: json.loads(sent[-1].content) for provider, sent in requests.items()}
+    assert payloads['gpt']['temperature'] == 0.2
+    assert payloads['cohere']['temperature'] == 0.2
+    assert 'options' not in payloads['ollama']
+    assert 'generationConfig' not in payloads['gemini']
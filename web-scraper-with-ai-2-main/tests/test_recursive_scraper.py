@@ -0,0 +1,98 @@
+#test_recursive_scraper.py
+
+import asyncio
+import pytest
+
+pytest.importorskip('transformers')
+
+import parse_pool
+import recursive_scraper
+from crawl_checkpoint import CrawlCheckpoint
+from recursive_scraper import RecursiveScraper
+from scraper_config import ScraperConfig
+
+SITE = 'http://site.test'
+PAGES = 31
+
+
+def page_url(n):
+    return f"{SITE}/p{n}"
+
+
+def page_html(n):
+    # Binary tree: p0 links to p1 and p2, p1 to p3 and p4, ...
+    links = ''.join(f'<p><a href="/p{child}">page</a></p>' for child in (2 * n + 1, 2 * n + 2) if child < PAGES)
+    return f"<html><body><p>Page {n}</p>{links}</body></html>"
+
+
+@pytest.fixture
+def make_scraper(monkeypatch):
+    monkeypatch.setattr(recursive_scraper, 'pipeline', lambda *args, **kwargs: None)
+    monkeypatch.setattr(parse_pool, 'PARSE_WORKERS', 0)
+
+    def make(checkpoint=None, **options):
+        config = ScraperConfig(
+            '', 'google', 1, 5, min_delay=0.01, max_delay=0.05, max_concurrency=4,
+            respect_robots=False, main_content=False, **options
+        )
+        scraper = RecursiveScraper(config, checkpoint)
+        scraper.fetched = []
+
+        async def fetch(url):
+            scraper.fetched.append(url)
+            await asyncio.sleep(0.02)
+            return page_html(int(url.rsplit('/p', 1)[1]))
+
+        scraper.fetch = fetch
+        return scraper
+    return make
+
+
+def test_single_host_crawl_is_breadth_first_under_budget(make_scraper):
+    # Without query terms every link scores the same, so the budget goes level by level
+    scraper = make_scraper(max_pages=7)
+    scraper.crawl([page_url(0)])
+    assert scraper.fetched == [page_url(n) for n in range(7)]
+    assert scraper.scheduler.parked_count() == 0
+
+
+def test_higher_scored_link_is_fetched_first(make_scraper):
+    scraper = make_scraper(max_pages=3)
+    scraper.scorer.score = lambda anchor, parent_score=0.0: 0.9 if anchor.url.endswith('/p2') else 0.1
+    scraper.crawl([page_url(0)])
+    assert scraper.fetched == [page_url(0), page_url(2), page_url(1)]
+
+
+def test_resumed_job_fetches_only_the_rest_of_its_frontier(make_scraper, tmp_path):
+    path = str(tmp_path / 'checkpoints.sqlite')
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        checkpoint.start('', 'google', 5)
+        first = make_scraper(checkpoint, max_pages=3)
+        first.crawl([page_url(0)])
+
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        checkpoint.start('', 'google', 5)
+        resumed = make_scraper(checkpoint, max_pages=7)
+        resumed.crawl([])
+
+    assert first.fetched == [page_url(n) for n in range(3)]
+    assert resumed.fetched == [page_url(n) for n in range(3, 7)]
+    assert set(resumed.text_data) == {page_url(n) for n in range(7)}
+
+
+def test_resumed_finished_job_fetches_nothing(make_scraper, tmp_path):
+    path = str(tmp_path / 'checkpoints.sqlite')
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        checkpoint.start('', 'google', 5)
+        first = make_scraper(checkpoint, max_pages=PAGES)
+        first.crawl([page_url(0)])
+        assert checkpoint.status() == 'done'
+
+    with CrawlCheckpoint('job', path=path) as checkpoint:
+        checkpoint.start('', 'google', 5)
+        resumed = make_scraper(checkpoint, max_pages=PAGES)
+        resumed.crawl([page_url(0)])
+
+    assert len(first.fetched) == PAGES
+    assert resumed.fetched == []
+    assert resumed.text_data == first.text_data
@@ -0,0 +1,72 @@
+#test_search_engines.py
+
+import os
+from contextlib import contextmanager
+import pytest
+from selenium.common.exceptions import TimeoutException
+import search_engines
+from serp_cache import SerpCache
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'files', 'serp_fixtures')
+
+with open(os.path.join(FIXTURES_DIR, 'google.html'), encoding='utf-8') as f:
+    GOOGLE_HTML = f.read()
+
+
+class FakeDriver:
+    """Serves the saved Google page, except for the result pages listed in failing, which time out."""
+
+    def __init__(self, failing=()):
+        self.failing = failing
+        self.page_source = ''
+
+    def get(self, url):
+        if any(url.endswith(f"&start={page * 10}") for page in self.failing):
+            raise TimeoutException()
+        self.page_source = GOOGLE_HTML
+
+
+class FakeDriverPool:
+    def __init__(self, driver):
+        self.fake = driver
+
+    @contextmanager
+    def driver(self):
+        yield self.fake
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = SerpCache(path=str(tmp_path / 'serp.sqlite'))
+    monkeypatch.setattr(search_engines, 'SERP_HTTP_ENABLED', False)
+    monkeypatch.setattr(search_engines, 'get_serp_cache', lambda: cache)
+    return cache
+
+
+def use_driver(monkeypatch, driver):
+    monkeypatch.setattr(search_engines, 'get_driver_pool', lambda: FakeDriverPool(driver))
+
+
+def test_page_that_failed_to_load_is_not_cached(monkeypatch, cache):
+    use_driver(monkeypatch, FakeDriver(failing=(1,)))
+    monkeypatch.setattr(search_engines, 'wait_for_any', lambda *args: None)
+
+    links = search_engines.get_search_results('python asyncio', 'Google', 2)
+
+    assert links
+    assert cache.get('Google', 'python asyncio', 0) == links
+    # The previous page's source must not be stored as page 2
+    assert cache.get('Google', 'python asyncio', 1) is None
+
+
+def test_page_without_results_is_not_cached(monkeypatch, cache):
+    use_driver(monkeypatch, FakeDriver())
+
+    def no_results(*args):
+        raise TimeoutException()
+
+    monkeypatch.setattr(search_engines, 'wait_for_any', no_results)
+
+    search_engines.get_search_results('python asyncio', 'Google', 1)
+
+    assert cache.get('Google', 'python asyncio', 0) is None
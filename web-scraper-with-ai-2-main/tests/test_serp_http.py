@@ -0,0 +1,22 @@
+#test_serp_http.py
+
+import json
+import os
+import pytest
+import html_extraction
+from serp_http import parse_serp
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'files', 'serp_fixtures')
+
+with open(os.path.join(FIXTURES_DIR, 'expected.json'), encoding='utf-8') as f:
+    EXPECTED = json.load(f)
+
+
+@pytest.mark.parametrize('backend', html_extraction.available_backends())
+@pytest.mark.parametrize('fixture', sorted(EXPECTED))
+def test_parse_serp_fixture(monkeypatch, fixture, backend):
+    """Saved results pages (<engine>[_<variant>].html) give the URLs listed in expected.json."""
+    monkeypatch.setattr(html_extraction, 'HTML_PARSER_BACKEND', backend)
+    with open(os.path.join(FIXTURES_DIR, f"{fixture}.html"), encoding='utf-8') as f:
+        html = f.read()
+    assert parse_serp(fixture.split('_')[0], html) == EXPECTED[fixture]
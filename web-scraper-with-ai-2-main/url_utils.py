@@ -0,0 +1,129 @@
+#url_utils.py
+
+import hashlib
+import math
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAMS = {
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'igshid', 'ref_src', 'spm',
+}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url):
+    """
+    Normalizes a URL so that trivially different spellings of the same page compare equal.
+
+    Lowercases scheme and host, drops default ports, fragments, utm_* and
+    other tracking parameters, sorts the query string and strips trailing
+    slashes from the path. Credentials in the URL are kept. The result is
+    still a fetchable URL.
+
+    :param url: Absolute URL to normalize.
+    :return: The canonical URL, or url unchanged if it cannot be parsed (e.g. an invalid port or IPv6 host).
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    if ':' in host:
+        host = f"[{host}]"
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if parts.username is not None:
+        userinfo = parts.username if parts.password is None else f"{parts.username}:{parts.password}"
+        host = f"{userinfo}@{host}"
+
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    return urlunsplit((scheme, host, path, urlencode(query, doseq=True), ''))
+
+
+def url_fingerprint(url):
+    """
+    64-bit fingerprint of a URL's canonical form. The scheme is left out,
+    so http and https variants of a page share a fingerprint.
+    """
+    canonical = canonicalize_url(url)
+    key = canonical.split('://', 1)[-1]
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 64-bit fingerprints. Uses
+    -capacity * ln(error_rate) / ln(2)^2 bits and never returns a false
+    negative; false positives occur at roughly error_rate.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, fingerprint):
+        # Double hashing: derive all probe positions from the two 32-bit halves
+        h1 = fingerprint & 0xFFFFFFFF
+        h2 = (fingerprint >> 32) | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, fingerprint):
+        added = False
+        for pos in self.positions(fingerprint):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, fingerprint):
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self.positions(fingerprint))
+
+    def __len__(self):
+        return self.count
+
+
+class VisitedSet:
+    """
+    Set of visited URLs that stores 64-bit fingerprints of their canonical
+    form instead of the strings, or a Bloom filter when bloom_capacity is given.
+    """
+
+    def __init__(self, bloom_capacity=None, bloom_error_rate=0.001):
+        if bloom_capacity:
+            self.fingerprints = BloomFilter(bloom_capacity, bloom_error_rate)
+        else:
+            self.fingerprints = set()
+
+    def add(self, url):
+        """
+        Marks a URL as visited.
+
+        :return: True if the URL had not been seen before.
+        """
+        fingerprint = url_fingerprint(url)
+        if fingerprint in self.fingerprints:
+            return False
+        self.fingerprints.add(fingerprint)
+        return True
+
+    def __contains__(self, url):
+        return url_fingerprint(url) in self.fingerprints
+
+    def __len__(self):
+        return len(self.fingerprints)
@@ -1,21 +1,68 @@
 #web_scraper.py
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from search_engines import get_search_results
 from get_google_search_links import get_google_search_links
 from file_processor import process_file
 from audio_processor import process_audio
 from link_processor import process_links
+from near_duplicates import NearDuplicateDetector
+from result_fusion import reciprocal_rank_fusion
+from config import SEARCH_CONCURRENCY
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def search_with_retries(translation: str, search_engine: Optional[str], numero_pagine: int, attempts: int = 3) -> List[str]:
+    """
+    Runs one search, retrying on errors.
+
+    :param search_engine: An engine of config.SEARCH_ENGINES, or None to use the Google fallback.
+    :return: The result links, empty if every attempt failed.
+    """
+    engine_label = search_engine or "Google"
+    for attempt in range(1, attempts + 1):
+        try:
+            logging.info(f"Searching on {engine_label}: {translation}")
+            if search_engine:
+                return get_search_results(translation, search_engine, numero_pagine)
+            return get_google_search_links(translation, numero_pagine)
+        except Exception as e:
+            logging.error(f"Error retrieving search results from {engine_label} (attempt {attempt}/{attempts}): {e}")
+    logging.critical(f"Failed to retrieve results from {engine_label} after multiple attempts.")
+    return []
+
+def search_all(
+    translations: Dict[str, str],
+    numero_pagine: int,
+    search_engines: Optional[List[str]] = None,
+    max_workers: int = SEARCH_CONCURRENCY
+) -> List[List[str]]:
+    """
+    Searches every translation on every engine, running up to max_workers
+    (language, engine) searches at the same time.
+
+    :return: The ranked links of each search, in language then engine order.
+    """
+    pairs = [
+        (translation, search_engine)
+        for translation in translations.values()
+        for search_engine in (search_engines or [None])
+    ]
+    if not pairs:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pairs)))) as executor:
+        link_lists = list(executor.map(lambda pair: search_with_retries(pair[0], pair[1], numero_pagine), pairs))
+    logging.info(f"{len(pairs)} searches returned {sum(map(len, link_lists))} links.")
+    return link_lists
+
 def scrape_and_process(
     query: str,
     translations: Dict[str, str],
     numero_pagine: int = 1,
-    use_ollama: bool = True,
+    use_ollama: bool = False,
     use_cohere: bool = False,
     use_gpt: bool = False,
     use_gemini: bool = False,
@@ -46,6 +93,7 @@ def scrape_and_process(
                     return []
 
     results = []
+    detector = NearDuplicateDetector()
 
     if process_file_path:
         logging.info(f"Processing file: {process_file_path}")
@@ -79,61 +127,27 @@ def scrape_and_process(
 
     else:
         for language, translation in translations.items():
-            logging.info(f"Processing translation for {language.title()}: {translation}")
-
-            if search_engines:
-                for search_engine in search_engines:
-                    retry_attempts = 3
-                    while retry_attempts > 0:
-                        try:
-                            logging.info(f"Searching on {search_engine}...")
-                            links = get_search_results(
-                                translation,
-                                search_engine,
-                                numero_pagine
-                            )
-                            process_links(
-                                links,
-                                query,
-                                output_files["scraped_texts"],
-                                results,
-                                use_ollama,
-                                use_cohere,
-                                use_gpt,
-                                use_gemini,
-                            )
-                            break
-                        except Exception as e:
-                            retry_attempts -= 1
-                            logging.error(f"Error retrieving search results from {search_engine}: {e}")
-                            if retry_attempts == 0:
-                                logging.critical(f"Failed to retrieve results from {search_engine} after multiple attempts.")
+            logging.info(f"Translation for {language.title()}: {translation}")
 
-            else:
-                retry_attempts = 3
-                while retry_attempts > 0:
-                    try:
-                        logging.info("Using Google as fallback search engine...")
-                        links = get_google_search_links(
-                            translation,
-                            numero_pagine
-                        )
-                        process_links(
-                            links,
-                            query,
-                            output_files["scraped_texts"],
-                            results,
-                            use_ollama,
-                            use_cohere,
-                            use_gpt,
-                            use_gemini,
-                        )
-                        break
-                    except Exception as e:
-                        retry_attempts -= 1
-                        logging.error(f"Error retrieving search results from Google: {e}")
-                        if retry_attempts == 0:
-                            logging.critical("Failed to retrieve results from Google after multiple attempts.")
+        # All searches first, in parallel, fused into one ranking of unique URLs,
+        # then a single processing stage over the best of them
+        links = reciprocal_rank_fusion(search_all(translations, numero_pagine, search_engines))
+        try:
+            process_links(
+                links,
+                query,
+                output_files["scraped_texts"],
+                results,
+                use_ollama,
+                use_cohere,
+                use_gpt,
+                use_gemini,
+                detector=detector,
+            )
+        except Exception as e:
+            logging.error(f"Error processing search results: {e}")
 
+    if detector.skipped:
+        logging.info(f"Skipped {detector.skipped} near-duplicate pages before summarization.")
     logging.info("Final result: %s", results)
     return results